@@ -42,7 +42,8 @@ class Job(SQLModel, table=True):
     match_score: int = 0
     matching_skills: List[str] = Field(default=[], sa_type=JSON)
     
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Indexed for the stored-results stage, which reads recent jobs first
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
 
 class JobStatus(str, enum.Enum):
     SAVED = "Saved"
@@ -63,3 +64,28 @@ class UserJob(SQLModel, table=True):
     
     user: Optional[User] = Relationship(back_populates="user_jobs")
     job: Optional[Job] = Relationship()
+
+class ScrapeTaskStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+class ScrapeTask(SQLModel, table=True):
+    """One scrape on the shared queue, run by `python -m app.worker` (SCRAPER_ISOLATION=queue)"""
+    id: Optional[int] = Field(default=None, primary_key=True)
+    site: str = Field(index=True)
+    input: dict = Field(default={}, sa_type=JSON)  # ScraperInput
+    status: ScrapeTaskStatus = Field(default=ScrapeTaskStatus.QUEUED, index=True)
+    priority: int = Field(default=0)  # governor.PRIORITIES, lower is claimed first
+    cancel_requested: bool = Field(default=False)
+    result: Optional[List[dict]] = Field(default=None, sa_type=JSON)  # JobPost list
+    error: Optional[str] = None
+    worker: Optional[str] = None
+    attempts: int = 0
+    
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    heartbeat_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -1,5 +1,5 @@
 
-from fastapi import FastAPI, UploadFile, File, Depends, HTTPException, Query, status
+from fastapi import FastAPI, UploadFile, File, Depends, HTTPException, Query, Request, status
 from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordRequestForm
@@ -8,12 +8,27 @@ from typing import List, Optional
 from datetime import timedelta
 from pydantic import BaseModel
 import json
+import asyncio
+import logging
 
 from app.db.session import create_db_and_tables, get_session
 from app.db.models import User, Resume, Job, UserJob, JobStatus
 from app.core.auth import get_current_user, authenticate_user, create_access_token, get_password_hash, ACCESS_TOKEN_EXPIRE_MINUTES
 from app.utils.text import extract_text_from_pdf_bytes, extract_keywords, extract_job_titles
 from app.services.job_service import JobService
+from app.services.governor import governor
+from app.services.singleflight import singleflight
+from app.services.cache import result_cache, negative_cache
+from app.services.planner import planner
+from app.services.result_queue import ResultQueue
+from app.services.site_selector import rank_sites
+from app.services.worker_pool import process_pool
+from app.services.scrape_queue import scrape_queue
+from app.services.quotas import user_quotas
+from app.services.shutdown import search_drain, SHUTDOWN_CLOSE_SECONDS
+from app.scrapers.registry import registry
+from app.scrapers import http, parsing
+from app.scrapers.ratelimit import rate_limiter
 
 # Pydantic Schemas for Auth
 class Token(BaseModel):
@@ -31,6 +46,7 @@ class UserRead(BaseModel):
     email: str
 
 app = FastAPI(title="Job Application Manager (Auth)")
+logger = logging.getLogger("API")
 
 # Allow CORS for frontend
 app.add_middleware(
@@ -44,6 +60,27 @@ app.add_middleware(
 @app.on_event("startup")
 def on_startup():
     create_db_and_tables()
+    search_drain.install_signal_handlers()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    # Usually already drained: uvicorn waits for open streams before running this
+    if not await search_drain.wait_idle():
+        logger.warning(f"{search_drain.active} searches still running at shutdown")
+    # Scrapes still going stop at their next page, quitting their browsers
+    singleflight.cancel_all()
+    try:
+        await asyncio.wait_for(asyncio.to_thread(governor.close), SHUTDOWN_CLOSE_SECONDS)
+    except asyncio.TimeoutError:
+        logger.warning("Scraper threads still busy after shutdown grace period")
+    await http.aclose_clients()
+    process_pool.shutdown()
+    parsing.shutdown()
+    registry.close_all()
+
+def reject_if_draining():
+    if search_drain.draining:
+        raise HTTPException(status_code=503, detail="Server is restarting, try again in a moment")
 
 # AUTHENTICATION
 @app.post("/auth/register", response_model=UserRead)
@@ -130,8 +167,9 @@ def delete_resume(resume_id: int, current_user: User = Depends(get_current_user)
     return {"ok": True}
 
 # JOBS & SEARCH
-@app.post("/search/jobs")
+@app.post("/search/jobs", dependencies=[Depends(reject_if_draining)])
 async def search_jobs(
+    request: Request,
     search_term: str = Query(..., description="Job title or keywords"),
     location: str = Query(..., description="Location"),
     results_wanted: int = Query(20, description="Number of results"),
@@ -143,7 +181,9 @@ async def search_jobs(
     date_posted: Optional[str] = Query(None),
     min_experience: Optional[int] = Query(None, description="Min years experience"),
     max_experience: Optional[int] = Query(None, description="Max years experience"),
-    sites: str = Query("linkedin,indeed", description="Comma separated sites"),
+    sites: str = Query("auto", description="Comma separated sites, or auto"),
+    deadline_ms: Optional[int] = Query(None, description="Return what was found once this many ms have passed"),
+    priority: str = Query("interactive", pattern="^(interactive|background)$", description="Background searches only use idle scrape capacity"),
     current_user: Optional[User] = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
@@ -154,7 +194,12 @@ async def search_jobs(
     if not resume:
         resume = session.exec(select(Resume).where(Resume.user_id == current_user.id).order_by(Resume.upload_date.desc())).first()
     
-    resume_skills = set(resume.extracted_skills) if resume else set()
+    resume_data = None
+    if resume:
+        resume_data = {
+            'extracted_skills': resume.extracted_skills or [],
+            'parsed_titles': resume.parsed_titles or []
+        }
     site_list = [s.strip() for s in sites.split(",")]
     
     # Use streaming service but collect all for sync endpoint
@@ -168,28 +213,47 @@ async def search_jobs(
         country=country,
         min_experience=min_experience,
         max_experience=max_experience,
-        resume_skills=resume_skills,
-        session=session
+        resume=resume_data,
+        session=session,
+        is_disconnected=request.is_disconnected,
+        deadline_ms=deadline_ms,
+        priority=priority,
+        user_id=current_user.id
     ):
         try:
             data = json.loads(msg)
+        except ValueError:
+            continue
+        if data["type"] == "error" and data.get("reason", "").startswith("quota"):
+            raise HTTPException(status_code=429, detail=data["message"])
+        try:
             if data["type"] == "result_batch":
                 jobs.extend(data["data"])
+            elif data["type"] == "result_evict":
+                evicted = set(data["job_urls"])
+                jobs = [j for j in jobs if j["job_url"] not in evicted]
         except: pass
-            
+    
+    # Best matches first
+    jobs.sort(key=lambda j: j.get("match_score") or 0, reverse=True)
     return jobs
 
-@app.get("/search/stream")
+@app.get("/search/stream", dependencies=[Depends(reject_if_draining)])
 async def stream_search_jobs(
+    request: Request,
     search_term: str = Query(..., description="Job title"),
     location: str = Query(..., description="Location"),
     results_wanted: int = Query(20),
-    sites: str = Query("linkedin,indeed"),
+    sites: str = Query("auto", description="Comma separated sites, or auto"),
     is_remote: bool = Query(False),
     country: str = Query("india"),
     min_experience: int = Query(None),
     max_experience: int = Query(None),
     offset: int = Query(0),
+    dry_run: bool = Query(False, description="Stream the scrape plan without scraping"),
+    deadline_ms: Optional[int] = Query(None, description="Stop and report what was found once this many ms have passed"),
+    include_stored: bool = Query(True, description="Stream matching jobs from earlier searches first"),
+    priority: str = Query("interactive", pattern="^(interactive|background)$", description="Background searches only use idle scrape capacity"),
     token: str = Query(...),
     session: Session = Depends(get_session)
 ):
@@ -239,11 +303,46 @@ async def stream_search_jobs(
             min_experience=min_experience,
             max_experience=max_experience,
             offset=offset,
-            session=session
+            session=session,
+            is_disconnected=request.is_disconnected,
+            dry_run=dry_run,
+            deadline_ms=deadline_ms,
+            include_stored=include_stored,
+            priority=priority,
+            user_id=user.id
         ),
         media_type="text/event-stream"
     )
 
+@app.get("/search/sites")
+def get_auto_sites(
+    country: str = Query("usa"),
+    is_remote: bool = Query(False),
+    current_user: User = Depends(get_current_user)
+):
+    """What auto mode would pick from, best first, with the score it's ranked by."""
+    return [{"site": site, "score": round(score, 3)} for site, score in rank_sites(country, is_remote)]
+
+@app.get("/search/stats")
+def get_search_stats(current_user: User = Depends(get_current_user)):
+    """Scraper capacity and pooling metrics for this worker process."""
+    return {
+        "governor": governor.stats(),
+        "registry": registry.stats(),
+        "singleflight": singleflight.stats(),
+        "result_cache": result_cache.stats(),
+        "negative_cache": negative_cache.stats(),
+        "planner": planner.stats(),
+        "result_queues": ResultQueue.stats(),
+        "workers": process_pool.stats(),
+        "user_quotas": user_quotas.stats(),
+        "shutdown": search_drain.stats(),
+        "scrape_queue": scrape_queue.stats(),
+        "parsing": parsing.stats(),
+        "rate_limits": rate_limiter.stats(),
+        "imports_ms": registry.import_report(),
+    }
+
 
 # TRACKING (UserJobs)
 class UserJobUpdate(BaseModel):
@@ -1,8 +1,8 @@
 
 from typing import List, Optional
 import urllib.parse
-from bs4 import BeautifulSoup
 from app.scrapers.base import BaseScraper
+from app.scrapers.parsing import parse_html, parse_adzuna
 from app.models.job import ScraperInput, JobPost
 
 class AdzunaScraper(BaseScraper):
@@ -57,72 +57,8 @@ class AdzunaScraper(BaseScraper):
                 self.logger.error(f"Failed to fetch {url}: {response.status_code}")
                 return []
             
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # Find job cards
-            cards = soup.find_all("article", attrs={"data-aid": True})
-            
-            for card in cards:
-                try:
-                    title_tag = card.find("h2").find("a")
-                    title = title_tag.get_text(strip=True)
-                    link = title_tag["href"]
-                    
-                    # Fix relative link
-                    if not link.startswith("http"):
-                        link = f"https://{domain}{link}"
-                        
-                    company_tag = card.find("div", class_="ui-company")
-                    company = company_tag.get_text(strip=True) if company_tag else "Unknown"
-                    
-                    location_tag = card.find("div", class_="ui-location")
-                    location = location_tag.get_text(strip=True) if location_tag else input_data.location
-                    
-                    salary_tag = card.find("div", class_="ui-salary")
-                    salary = salary_tag.get_text(strip=True) if salary_tag else None
-                    
-                    snippet_tag = card.find("span", class_="max-snippet-height")
-                    description = snippet_tag.get_text(strip=True) if snippet_tag else ""
-                    
-                    # Parse salary
-                    salary_min = None
-                    salary_max = None
-                    if salary:
-                        import re
-                        # simple extraction of numbers
-                        nums = re.findall(r'[\d,]+(?:[kK])?', salary.replace("$", "").replace("£", "").replace("€", ""))
-                        clean_nums = []
-                        for n in nums:
-                            n = n.replace(",", "")
-                            mult = 1
-                            if "k" in n.lower():
-                                n = n.lower().replace("k", "")
-                                mult = 1000
-                            try:
-                                val = int(float(n) * mult)
-                                clean_nums.append(val)
-                            except: pass
-                        
-                        if clean_nums:
-                            salary_min = min(clean_nums)
-                            salary_max = max(clean_nums)
-
-                    job = JobPost(
-                        title=title,
-                        company=company,
-                        location=location,
-                        job_url=link,
-                        description=description,
-                        salary_min=salary_min,
-                        salary_max=salary_max,
-                        site="Adzuna",
-                        date_posted=None 
-                    )
-                    job_posts.append(job)
-                    
-                except Exception as e:
-                    self.logger.warning(f"Error parsing card: {e}")
-                    continue
+            records = parse_html(parse_adzuna, response.text, domain, input_data.location)
+            job_posts = [JobPost(**record) for record in records]
                     
         except Exception as e:
             self.logger.error(f"Scraping error: {e}")
@@ -8,7 +8,7 @@ class DiceScraper(BaseScraper):
         super().__init__("Dice", proxies)
         self.base_url = "https://job-search-api.svc.dhigroupinc.com/v1/dice/jobs/search"
 
-    def scrape(self, input_data: ScraperInput) -> List[JobPost]:
+    async def ascrape(self, input_data: ScraperInput) -> List[JobPost]:
         job_posts = []
         
         # Dice API uses specific parameters
@@ -28,7 +28,7 @@ class DiceScraper(BaseScraper):
                 "Content-Type": "application/json"
             }
             
-            response = self.safe_get(self.base_url, params=params, headers=headers)
+            response = await self.asafe_get(self.base_url, params=params, headers=headers)
             if response.status_code != 200:
                 self.logger.error(f"Failed to fetch Dice jobs: {response.status_code}")
                 return []
@@ -1,13 +1,11 @@
 import logging
-import time
-import random
 import json
 import re
 from typing import List, Optional, Tuple
 from datetime import datetime, timedelta
 import requests # Fallback for some requests if needed, but perfer tls_client
 
-from app.scrapers.base import BaseScraper, ScraperError
+from app.scrapers.base import BaseScraper, ScraperError, ScrapeCancelled
 from app.models.job import JobPost, ScraperInput, JobType
 
 # Constants
@@ -108,6 +106,8 @@ class GlassdoorScraper(BaseScraper):
         for page in range(1, 15): # Limit pages (supports ~400 jobs)
             if len(jobs) >= input_data.results_wanted:
                 break
+            if self.cancelled:
+                break
                 
             self.logger.debug(f"Fetching page {page}")
             try:
@@ -117,7 +117,10 @@ class GlassdoorScraper(BaseScraper):
                 # BaseScraper uses tls_client which should be better.
                 # Endpoint is /graph
                 
-                response = self.session.post(f"{self.base_url}/graph", json=payload)
+                url = f"{self.base_url}/graph"
+                self.throttle(url)
+                response = self.session.post(url, json=payload)
+                self.record(url, response)
                 
                 if response.status_code != 200:
                     self.logger.error(f"GD Error: {response.status_code}")
@@ -152,9 +155,9 @@ class GlassdoorScraper(BaseScraper):
                 if not next_cursor:
                     break
                 cursor = next_cursor
-                
-                time.sleep(random.uniform(2, 5))
 
+            except ScrapeCancelled:
+                raise
             except Exception as e:
                 self.logger.error(f"Scrape error: {e}")
                 break
@@ -163,11 +166,16 @@ class GlassdoorScraper(BaseScraper):
 
     def _get_csrf_token(self):
         try:
-            res = self.session.get(f"{self.base_url}/Job/computer-science-jobs.htm")
+            url = f"{self.base_url}/Job/computer-science-jobs.htm"
+            self.throttle(url)
+            res = self.session.get(url)
+            self.record(url, res)
             pattern = r'"token":\s*"([^"]+)"'
             matches = re.findall(pattern, res.text)
             if matches:
                 return matches[0]
+        except ScrapeCancelled:
+            raise
         except:
             pass
         return None
@@ -176,13 +184,17 @@ class GlassdoorScraper(BaseScraper):
         if not location: return None, None
         try:
             url = f"{self.base_url}/findPopularLocationAjax.htm?maxLocationsToReturn=10&term={location}"
+            self.throttle(url)
             res = self.session.get(url)
+            self.record(url, res)
             items = res.json()
             if items:
                 # Type mapping
                 t_map = {"C": "CITY", "S": "STATE", "N": "COUNTRY"}
                 l_type = items[0]["locationType"]
                 return int(items[0]["locationId"]), t_map.get(l_type, "CITY")
+        except ScrapeCancelled:
+            raise
         except Exception as e:
             self.logger.error(f"Loc fetch failed: {e}")
             
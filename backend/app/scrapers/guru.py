@@ -1,5 +1,4 @@
 import logging
-import time
 from datetime import datetime, timedelta, date
 from typing import List, Optional
 import re
@@ -30,6 +29,9 @@ class GuruScraper(BaseScraper):
         driver = None
 
         try:
+            # Don't launch Chrome for a search that was already abandoned
+            self.check_cancelled()
+            
             # Setup Selenium
             options = Options()
             options.add_argument("--headless=new")
@@ -52,7 +54,7 @@ class GuruScraper(BaseScraper):
             driver.get(full_url)
             
             # Wait for content
-            time.sleep(5) 
+            self.pause(5)
             
             # Parse with BS4
             soup = BeautifulSoup(driver.page_source, "html.parser")
@@ -9,7 +9,7 @@ class HimalayasScraper(BaseScraper):
         super().__init__("Himalayas", proxies)
         self.base_url = "https://himalayas.app/jobs/api"
 
-    def scrape(self, input_data: ScraperInput) -> List[JobPost]:
+    async def ascrape(self, input_data: ScraperInput) -> List[JobPost]:
         job_posts = []
         
         # Himalayas API supports limit and offset
@@ -19,7 +19,7 @@ class HimalayasScraper(BaseScraper):
         }
         
         try:
-            response = self.safe_get(self.base_url, params=params)
+            response = await self.asafe_get(self.base_url, params=params)
             if response.status_code != 200:
                 self.logger.error(f"Failed to fetch Himalayas jobs: {response.status_code}")
                 return []
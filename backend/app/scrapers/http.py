@@ -0,0 +1,66 @@
+import os
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+import httpx
+
+# Shared connection pool for native async scrapers
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 100))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", 20))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", 20))
+
+# One client per proxy (httpx binds proxies to the client, not the request)
+_clients: Dict[Optional[str], httpx.AsyncClient] = {}
+
+# Set while a sync caller drives an async scraper on its own short-lived event loop
+_private_client: ContextVar[Optional[httpx.AsyncClient]] = ContextVar("private_client", default=None)
+
+
+def _build_client(proxy: Optional[str] = None) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+        ),
+        timeout=HTTP_TIMEOUT,
+        follow_redirects=True,
+        proxy=proxy,
+    )
+
+
+def get_client(proxy: Optional[str] = None) -> httpx.AsyncClient:
+    """
+    Pooled client shared by every async scrape on the API's event loop.
+    """
+    private = _private_client.get()
+    if private is not None:
+        return private
+    client = _clients.get(proxy)
+    if client is None or client.is_closed:
+        client = _build_client(proxy)
+        _clients[proxy] = client
+    return client
+
+
+@asynccontextmanager
+async def private_client():
+    """
+    Use a throwaway client for the duration of the block. Needed when an async
+    scraper runs under asyncio.run() in a worker thread, since the shared clients
+    belong to the API's loop.
+    """
+    client = _build_client()
+    token = _private_client.set(client)
+    try:
+        yield client
+    finally:
+        _private_client.reset(token)
+        await client.aclose()
+
+
+async def aclose_clients():
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
@@ -1,11 +1,9 @@
 import logging
-import time
-import random
 import json
 from typing import List, Optional
 from datetime import datetime
 
-from app.scrapers.base import BaseScraper, ScraperError
+from app.scrapers.base import BaseScraper, ScraperError, ScrapeCancelled
 from app.models.job import JobPost, ScraperInput, JobType
 
 # Constants
@@ -93,26 +91,18 @@ class IndeedScraper(BaseScraper):
     def __init__(self, proxies: Optional[List[str]] = None):
         super().__init__("Indeed", proxies)
         self.jobs_per_page = 100
-        # Override headers with mobile app headers required for this API
-        self.session.headers.update(API_HEADERS)
-        # We might need to clear browser-specific headers that BaseScraper sets
-        # if Indeed API is strict, but usually extra headers are ignored.
-        # However, Sec-Ch-Ua headers from BaseScraper (Chrome) might conflict with iPhone API UA.
-        # Safer to clear them or overwrite.
-        if "sec-ch-ua" in self.session.headers:
-            del self.session.headers["sec-ch-ua"]
-        if "sec-ch-ua-platform" in self.session.headers:
-             del self.session.headers["sec-ch-ua-platform"]
-        if "sec-ch-ua-mobile" in self.session.headers:
-             del self.session.headers["sec-ch-ua-mobile"]
+        # Mobile app headers required for this API are sent with every request (API_HEADERS)
 
-    def scrape(self, input_data: ScraperInput) -> List[JobPost]:
+    async def ascrape(self, input_data: ScraperInput) -> List[JobPost]:
         self.logger.info(f"Scraping Indeed for '{input_data.search_term}'")
         jobs = []
         cursor = None
         seen_urls = set()
         
         while len(jobs) < input_data.results_wanted:
+            if self.cancelled:
+                break
+                
             self.logger.debug(f"Fetching page with cursor: {cursor}")
             
             try:
@@ -150,7 +140,7 @@ class IndeedScraper(BaseScraper):
                 # Debug payload
                 # self.logger.debug(f"Payload: {payload}")
                 
-                response = self.session.post(API_URL, json=payload, headers=API_HEADERS)
+                response = await self.arequest("POST", API_URL, json=payload, headers=API_HEADERS)
                 
                 if response.status_code != 200:
                     self.logger.error(f"Indeed API Error: {response.status_code} - {response.text}")
@@ -183,9 +173,9 @@ class IndeedScraper(BaseScraper):
                 if not next_cursor:
                     break
                 cursor = next_cursor
-                
-                time.sleep(random.uniform(2, 5))
-                
+
+            except ScrapeCancelled:
+                raise
             except Exception as e:
                 self.logger.error(f"Scraping error: {e}")
                 import traceback
@@ -9,7 +9,7 @@ class JobicyScraper(BaseScraper):
         super().__init__("Jobicy", proxies)
         self.base_url = "https://jobicy.com/api/v2/remote-jobs"
 
-    def scrape(self, input_data: ScraperInput) -> List[JobPost]:
+    async def ascrape(self, input_data: ScraperInput) -> List[JobPost]:
         job_posts = []
         
         # Jobicy API Params:
@@ -26,7 +26,7 @@ class JobicyScraper(BaseScraper):
              params["geo"] = input_data.location
         
         try:
-            response = self.safe_get(self.base_url, params=params)
+            response = await self.asafe_get(self.base_url, params=params)
             if response.status_code != 200:
                 self.logger.error(f"Failed to fetch Jobicy jobs: {response.status_code}")
                 return []
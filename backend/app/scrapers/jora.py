@@ -1,8 +1,8 @@
 
 import urllib.parse
 from typing import List, Optional
-from bs4 import BeautifulSoup
 from app.scrapers.base import BaseScraper
+from app.scrapers.parsing import parse_html, parse_jora
 from app.models.job import ScraperInput, JobPost
 
 class JoraScraper(BaseScraper):
@@ -44,61 +44,14 @@ class JoraScraper(BaseScraper):
                 self.logger.error(f"Failed to fetch Jora: {response.status_code}")
                 return []
             
-            soup = BeautifulSoup(response.content, "html.parser")
+            records = parse_html(parse_jora, response.text)
             
-            # Identify job cards
-            # Usually div with class 'job-card' or 'result'
-            # Let's try standard 'result' or inspect typical Jora structure
-            # Typical Jora: <div class="job-card"> or <li class="result">
-            
-            cards = soup.find_all("div", class_="job-card")
-            if not cards:
-                cards = soup.find_all("li", class_="result")
-            
-            if not cards:
+            if not records:
                 self.logger.warning("No Jora cards found. Dumping HTML.")
                 with open("jora_dump.html", "w") as f:
-                    f.write(soup.prettify())
+                    f.write(response.text)
                 
-            for card in cards:
-                try:
-                    title_tag = card.find("h3", class_="job-title") or card.find("a", class_="job-link")
-                    title = title_tag.get_text(strip=True) if title_tag else "Unknown"
-                    
-                    link_tag = card.find("a", class_="job-link")
-                    if not link_tag and title_tag and title_tag.name == 'a':
-                        link_tag = title_tag
-                    
-                    job_url = "https://us.jora.com" + link_tag["href"] if link_tag and link_tag.get("href") else ""
-                    
-                    company_tag = card.find("span", class_="company")
-                    company = company_tag.get_text(strip=True) if company_tag else "Unknown"
-                    
-                    location_tag = card.find("span", class_="location")
-                    location = location_tag.get_text(strip=True) if location_tag else "Unknown"
-                    
-                    description_tag = card.find("div", class_="summary")
-                    description = description_tag.get_text(strip=True) if description_tag else ""
-                    
-                    date_tag = card.find("span", class_="date")
-                    # Date parsing logic could be added here similar to others
-                    
-                    job = JobPost(
-                        title=title,
-                        company=company,
-                        location=location,
-                        job_url=job_url,
-                        description=description,
-                        salary_min=None,
-                        salary_max=None,
-                        site="Jora",
-                        date_posted=None
-                    )
-                    job_posts.append(job)
-                    
-                except Exception as e:
-                    self.logger.warning(f"Error parsing Jora card: {e}")
-                    continue
+            job_posts = [JobPost(**record) for record in records]
                     
         except Exception as e:
             self.logger.error(f"Jora scraping error: {e}")
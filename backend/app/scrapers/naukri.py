@@ -1,11 +1,9 @@
 import logging
 import json
-import time
-import random
 from typing import List, Optional
 from datetime import datetime
 
-from app.scrapers.base import BaseScraper, ScraperError
+from app.scrapers.base import BaseScraper, ScraperError, ScrapeCancelled
 from app.models.job import JobPost, ScraperInput, JobType
 
 # Constants
@@ -33,10 +31,8 @@ class NaukriScraper(BaseScraper):
     def __init__(self, proxies: Optional[List[str]] = None):
         super().__init__("Naukri", proxies)
         self.base_url = "https://www.naukri.com"
-        # Update headers
-        self.session.headers.update(HEADERS)
 
-    def scrape(self, input_data: ScraperInput) -> List[JobPost]:
+    async def ascrape(self, input_data: ScraperInput) -> List[JobPost]:
         self.logger.info(f"Scraping Naukri for '{input_data.search_term}'")
         jobs = []
         
@@ -44,6 +40,8 @@ class NaukriScraper(BaseScraper):
         for page in range(1, 5):
             if len(jobs) >= input_data.results_wanted:
                 break
+            if self.cancelled:
+                break
                 
             self.logger.debug(f"Fetching page {page}")
             
@@ -59,9 +57,7 @@ class NaukriScraper(BaseScraper):
                 }
                 
                 # Naukri often requires specific query params construction or standard GET
-                # tls_client handle params automatically
-                
-                response = self.session.get(API_URL, params=params)
+                response = await self.arequest("GET", API_URL, params=params, headers=HEADERS)
                 
                 if response.status_code != 200:
                     self.logger.error(f"Naukri Error: {response.status_code}")
@@ -84,9 +80,9 @@ class NaukriScraper(BaseScraper):
                     post = self._process_job(j)
                     if post:
                         jobs.append(post)
-                
-                time.sleep(random.uniform(2, 5))
-                
+
+            except ScrapeCancelled:
+                raise
             except Exception as e:
                 self.logger.error(f"Scrape error: {e}")
                 break
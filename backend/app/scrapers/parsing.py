@@ -0,0 +1,377 @@
+import logging
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse, urlunparse
+
+logger = logging.getLogger("Parsing")
+
+# Processes parsing HTML pages for the scrapers (0 parses in the calling thread)
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", min(4, os.cpu_count() or 1)))
+# Pages smaller than this are parsed in the calling thread, shipping them costs more
+PARSE_INLINE_BYTES = int(os.getenv("PARSE_INLINE_BYTES", 16 * 1024))
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+# Metrics
+_counts = {"pooled": 0, "inline": 0, "pool_restarts": 0}
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    global _pool
+    # Scraper worker processes (SCRAPER_ISOLATION=process) are daemonic and may not have children
+    if PARSE_WORKERS <= 0 or multiprocessing.current_process().daemon:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # Fresh interpreters, forking a threaded API process isn't safe
+            _pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def parse_html(parser: Callable[..., Any], html: str, *args) -> Any:
+    """
+    Run `parser(html, *args)` in the parse process pool and wait for it.
+
+    Parsing with BeautifulSoup is pure Python and holds the GIL, so with many
+    scrapes in flight it serializes every scraper thread. The pool parses on
+    other cores and sends back compact job records (JobPost keyword dicts).
+    Called from scraper threads; falls back to parsing in place if the pool is
+    disabled or unavailable (daemonic scraper workers), the page is small, or a
+    worker died.
+    """
+    global _pool
+    pool = _get_pool() if len(html) >= PARSE_INLINE_BYTES else None
+    if pool is None:
+        _counts["inline"] += 1
+        return parser(html, *args)
+    try:
+        records = pool.submit(parser, html, *args).result()
+        _counts["pooled"] += 1
+        return records
+    except BrokenProcessPool:
+        logger.warning("Parse pool broke, starting a new one")
+        _counts["pool_restarts"] += 1
+        _counts["inline"] += 1
+        with _pool_lock:
+            if _pool is pool:
+                _pool = None
+        pool.shutdown(wait=False)
+        return parser(html, *args)
+
+
+def shutdown():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def stats() -> dict:
+    return {"workers": PARSE_WORKERS, "inline_below_bytes": PARSE_INLINE_BYTES, **_counts}
+
+
+# Parsers below run in the pool's processes: module-level functions of the raw
+# page (plus plain arguments) returning JobPost keyword dicts. They import bs4
+# themselves so the API process (which imports this module for its stats) doesn't
+# load BeautifulSoup at startup.
+
+def parse_linkedin(html: str) -> Tuple[int, List[Dict]]:
+    """Returns the number of job cards on the page (LinkedIn pages by card) and the records."""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+    cards = soup.find_all("div", class_="base-search-card")
+    records = []
+    for card in cards:
+        try:
+            # Title
+            title_tag = card.find("span", class_="sr-only")
+            title = title_tag.get_text(strip=True) if title_tag else "N/A"
+
+            # Company
+            company_tag = card.find("h4", class_="base-search-card__subtitle")
+            company = "Unknown"
+            company_url = None
+            if company_tag:
+                a_tag = company_tag.find("a")
+                if a_tag:
+                    company = a_tag.get_text(strip=True)
+                    href = a_tag.get("href")
+                    if href:
+                        company_url = urlunparse(urlparse(href)._replace(query=""))
+                else:
+                    company = company_tag.get_text(strip=True)
+
+            # Location
+            loc_tag = card.find("span", class_="job-search-card__location")
+            location = loc_tag.get_text(strip=True) if loc_tag else "N/A"
+
+            # URL & ID
+            a_link = card.find("a", class_="base-card__full-link")
+            if not a_link:
+                continue
+            job_url = a_link.get("href").split("?")[0]
+            # ID is usually last part of URL path
+            job_id = job_url.split("-")[-1]
+
+            records.append({
+                "id": f"li-{job_id}",
+                "title": title,
+                "company": company,
+                "job_url": job_url,
+                "location": location,
+                "site": "LinkedIn",
+                "company_url": company_url,
+            })
+        except Exception as e:
+            logger.warning(f"Error processing LinkedIn card: {e}")
+    return len(cards), records
+
+
+def parse_bayt(html: str, base_url: str) -> List[Dict]:
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+    records = []
+    for job_elem in soup.find_all("li", attrs={"data-js-job": ""}):
+        try:
+            # Title
+            title_tag = job_elem.find("h2")
+            if not title_tag:
+                continue
+            title = title_tag.get_text(strip=True)
+
+            # URL
+            a_tag = title_tag.find("a")
+            job_url = base_url + a_tag["href"].strip() if a_tag else ""
+
+            # Company
+            company = "Unknown"
+            company_tag = job_elem.find("div", class_="t-nowrap p10l")
+            if company_tag and company_tag.find("span"):
+                company = company_tag.find("span").get_text(strip=True)
+
+            # Location
+            location = "Unknown"
+            loc_tag = job_elem.find("div", class_="t-mute t-small")
+            if loc_tag:
+                location = loc_tag.get_text(strip=True)
+
+            if title and job_url:
+                records.append({"title": title, "company": company, "job_url": job_url, "location": location, "site": "Bayt"})
+        except Exception as e:
+            logger.warning(f"Error parsing Bayt job info: {e}")
+    return records
+
+
+def parse_jora(html: str) -> List[Dict]:
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+    # Typical Jora: <div class="job-card"> or <li class="result">
+    cards = soup.find_all("div", class_="job-card") or soup.find_all("li", class_="result")
+    records = []
+    for card in cards:
+        try:
+            title_tag = card.find("h3", class_="job-title") or card.find("a", class_="job-link")
+            title = title_tag.get_text(strip=True) if title_tag else "Unknown"
+
+            link_tag = card.find("a", class_="job-link")
+            if not link_tag and title_tag and title_tag.name == 'a':
+                link_tag = title_tag
+            job_url = "https://us.jora.com" + link_tag["href"] if link_tag and link_tag.get("href") else ""
+
+            company_tag = card.find("span", class_="company")
+            company = company_tag.get_text(strip=True) if company_tag else "Unknown"
+
+            location_tag = card.find("span", class_="location")
+            location = location_tag.get_text(strip=True) if location_tag else "Unknown"
+
+            description_tag = card.find("div", class_="summary")
+            description = description_tag.get_text(strip=True) if description_tag else ""
+
+            records.append({
+                "title": title,
+                "company": company,
+                "location": location,
+                "job_url": job_url,
+                "description": description,
+                "site": "Jora",
+            })
+        except Exception as e:
+            logger.warning(f"Error parsing Jora card: {e}")
+    return records
+
+
+def _parse_salary(salary: str):
+    # simple extraction of numbers
+    nums = re.findall(r'[\d,]+(?:[kK])?', salary.replace("$", "").replace("£", "").replace("€", ""))
+    clean_nums = []
+    for n in nums:
+        n = n.replace(",", "")
+        mult = 1
+        if "k" in n.lower():
+            n = n.lower().replace("k", "")
+            mult = 1000
+        try:
+            clean_nums.append(int(float(n) * mult))
+        except ValueError:
+            pass
+    if clean_nums:
+        return min(clean_nums), max(clean_nums)
+    return None, None
+
+
+def parse_adzuna(html: str, domain: str, default_location: str) -> List[Dict]:
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+    records = []
+    for card in soup.find_all("article", attrs={"data-aid": True}):
+        try:
+            title_tag = card.find("h2").find("a")
+            title = title_tag.get_text(strip=True)
+            link = title_tag["href"]
+
+            # Fix relative link
+            if not link.startswith("http"):
+                link = f"https://{domain}{link}"
+
+            company_tag = card.find("div", class_="ui-company")
+            company = company_tag.get_text(strip=True) if company_tag else "Unknown"
+
+            location_tag = card.find("div", class_="ui-location")
+            location = location_tag.get_text(strip=True) if location_tag else default_location
+
+            salary_tag = card.find("div", class_="ui-salary")
+            salary = salary_tag.get_text(strip=True) if salary_tag else None
+
+            snippet_tag = card.find("span", class_="max-snippet-height")
+            description = snippet_tag.get_text(strip=True) if snippet_tag else ""
+
+            salary_min, salary_max = _parse_salary(salary) if salary else (None, None)
+
+            records.append({
+                "title": title,
+                "company": company,
+                "location": location,
+                "job_url": link,
+                "description": description,
+                "salary_min": salary_min,
+                "salary_max": salary_max,
+                "site": "Adzuna",
+            })
+        except Exception as e:
+            logger.warning(f"Error parsing Adzuna card: {e}")
+    return records
+
+
+def parse_powertofly(html: str) -> List[Dict]:
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+    records = []
+    # Cards are in buttons with class "job" inside .js-elem
+    for card in soup.select("div.js-elem .job.box"):
+        try:
+            title_tag = card.find("h5", class_="title")
+            title = title_tag.get_text(strip=True) if title_tag else "Unknown"
+
+            company_tag = card.find("span", class_="company")
+            company = company_tag.get_text(strip=True) if company_tag else "Unknown"
+
+            location_tag = card.find("span", class_="location")
+            location = "Remote"
+            if location_tag:
+                # There are nested spans sometimes, just get text
+                location = location_tag.get_text(" ", strip=True)  # "Remote · United States"
+
+            job_id = card.get("data-job-id")
+            if not job_id:
+                continue
+
+            records.append({
+                "title": title,
+                "company": company,
+                "location": location,
+                "job_url": f"https://powertofly.com/jobs/detail/{job_id}",
+                "description": "",
+                "site": "PowerToFly",
+            })
+        except Exception as e:
+            logger.warning(f"Error parsing PowerToFly card: {e}")
+    return records
+
+
+def parse_relative_date(text: str):
+    """'3 hours ago', 'Yesterday', '5 days ago' -> date (today when unsure)."""
+    text = text.lower()
+    today = datetime.now().date()
+
+    if "hour" in text or "minute" in text or "second" in text:
+        return today
+    if "yesterday" in text:
+        return today - timedelta(days=1)
+    if "days ago" in text:
+        try:
+            days = int(re.search(r"(\d+)", text).group(1))
+            return today - timedelta(days=days)
+        except (AttributeError, ValueError):
+            return today
+    return today
+
+
+def parse_builtin(html: str, base_url: str) -> List[Dict]:
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+    records = []
+    for card in soup.find_all("div", id=re.compile(r"^job-card-\d+")):
+        try:
+            # Title
+            title_elem = card.find("h2")
+            if not title_elem:
+                continue
+            title_link = title_elem.find("a")
+            title = title_link.get_text(strip=True) if title_link else title_elem.get_text(strip=True)
+
+            job_path = title_link["href"] if title_link and title_link.has_attr("href") else ""
+            job_url = f"{base_url}{job_path}" if job_path.startswith("/") else job_path
+
+            # Company
+            company_elem = card.find("div", class_="left-side-tile-item-2")
+            company = company_elem.get_text(strip=True) if company_elem else "BuiltIn Community"
+
+            # Location: the text of the row holding the location icon
+            location = "Unknown"
+            location_elem = card.find("i", class_="fa-location-dot")
+            if location_elem:
+                location_container = location_elem.find_parent("div", class_="gap-sm")
+                if location_container:
+                    location = location_container.get_text(strip=True)
+
+            # Date
+            date_elem = card.find("span", class_="bg-gray-01") or card.find("span", class_="text-gray-03")
+            date_text = date_elem.get_text(strip=True) if date_elem else ""
+
+            # Description (from collapsed area)
+            # ID is job-card-{id}, collapsed area is drop-data-{id}
+            card_id = card.get("id", "").replace("job-card-", "")
+            desc_div = soup.find("div", id=f"drop-data-{card_id}")
+            description = desc_div.get_text(strip=True) if desc_div else ""
+
+            records.append({
+                "title": title,
+                "company": company,
+                "job_url": job_url,
+                "location": location,
+                "date_posted": parse_relative_date(date_text),
+                "description": description,
+                "is_remote": "remote" in location.lower(),
+                "site": "builtin",
+            })
+        except Exception as e:
+            logger.warning(f"Error parsing BuiltIn job card: {e}")
+    return records
@@ -1,7 +1,7 @@
 
 from typing import List, Optional
-from bs4 import BeautifulSoup
 from app.scrapers.base import BaseScraper
+from app.scrapers.parsing import parse_html, parse_powertofly
 from app.models.job import ScraperInput, JobPost
 
 class PowerToFlyScraper(BaseScraper):
@@ -29,56 +29,13 @@ class PowerToFlyScraper(BaseScraper):
                 self.logger.error(f"Failed to fetch PowerToFly: {response.status_code}")
                 return []
             
-            soup = BeautifulSoup(response.content, "html.parser")
+            records = parse_html(parse_powertofly, response.text)
             
-            # Cards are in buttons with class "job" inside .js-elem
-            # But specific selector: button.job.box
-            cards = soup.select("div.js-elem .job.box")
+            self.logger.info(f"Found {len(records)} jobs on PowerToFly")
             
-            self.logger.info(f"Found {len(cards)} jobs on PowerToFly")
-            
-            for card in cards:
-                try:
-                    title_tag = card.find("h5", class_="title")
-                    title = title_tag.get_text(strip=True) if title_tag else "Unknown"
-                    
-                    company_tag = card.find("span", class_="company")
-                    company = company_tag.get_text(strip=True) if company_tag else "Unknown"
-                    
-                    location_tag = card.find("span", class_="location")
-                    location = "Remote"
-                    if location_tag:
-                         # There are nested spans sometimes, just get text
-                         location = location_tag.get_text(" ", strip=True) # "Remote · United States"
-                    
-                    job_id = card.get("data-job-id")
-                    if job_id:
-                        job_url = f"https://powertofly.com/jobs/detail/{job_id}"
-                    else:
-                        # Fallback?
-                        continue
-                        
-                    # Date is difficult in list view.
-                    
-                    job = JobPost(
-                        title=title,
-                        company=company,
-                        location=location,
-                        job_url=job_url,
-                        description="",
-                        salary_min=None,
-                        salary_max=None,
-                        site="PowerToFly",
-                        date_posted=None
-                    )
-                    job_posts.append(job)
-                    
-                    if input_data.results_wanted and len(job_posts) >= input_data.results_wanted:
-                        break
-                        
-                except Exception as e:
-                    self.logger.warning(f"Error parsing PowerToFly card: {e}")
-                    continue
+            job_posts = [JobPost(**record) for record in records]
+            if input_data.results_wanted:
+                job_posts = job_posts[:input_data.results_wanted]
                     
         except Exception as e:
             self.logger.error(f"PowerToFly scraping error: {e}")
@@ -0,0 +1,176 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger("HostRateLimiter")
+
+# Requests per second and burst for hosts without their own limit
+SCRAPER_HOST_RATE = float(os.getenv("SCRAPER_HOST_RATE", 1.0))
+SCRAPER_HOST_BURST = int(os.getenv("SCRAPER_HOST_BURST", 3))
+
+# Per-domain limits (rate per second, burst), a domain covers its subdomains.
+# Override with e.g. SCRAPER_HOST_LIMITS="linkedin.com=0.2:1,indeed.com=1:3"
+DEFAULT_HOST_LIMITS = {
+    "linkedin.com": (0.25, 2),  # Guest API starts answering 429 quickly
+    "indeed.com": (0.5, 2),
+    "glassdoor.com": (0.3, 1),
+    "naukri.com": (0.5, 2),
+    "ziprecruiter.com": (0.4, 1),
+}
+
+# After a 429/503 a host runs at this fraction of its rate, then recovers per success
+BACKOFF_FACTOR = 0.5
+MIN_RATE_FRACTION = 0.125
+RECOVERY_FRACTION = 0.05
+# Retry-After values are capped, a misbehaving header shouldn't park a host for hours
+MAX_RETRY_AFTER_SECONDS = 120
+
+
+def _parse_host_limits(value: str) -> Dict[str, Tuple[float, int]]:
+    limits = dict(DEFAULT_HOST_LIMITS)
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        domain, limit = item.split("=", 1)
+        try:
+            rate, _, burst = limit.partition(":")
+            limits[domain.strip().lower()] = (max(0.01, float(rate)), max(1, int(burst or 1)))
+        except ValueError:
+            logger.warning(f"Ignoring bad SCRAPER_HOST_LIMITS entry: {item}")
+    return limits
+
+
+class TokenBucket:
+    """
+    Token bucket with reservations: take() always succeeds and returns how long
+    the caller has to wait for its token, so waiters are spaced out in arrival
+    order without polling, and the caller decides how to wait (thread or event
+    loop). Thread-safe.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0.0
+        self.backoffs = 0
+
+    def _refill(self, now: float):
+        # `updated` lies in the future while a Retry-After block lasts, nothing refills before it
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def take(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = max(0.0, self.updated - now - self.tokens / self.rate)
+            self.requests += 1
+            if wait > 0:
+                self.throttled += 1
+                self.waited += wait
+            return wait
+
+    def give_back(self):
+        """Return a reserved token the caller didn't use (cancelled while waiting)."""
+        with self._lock:
+            self.tokens = min(self.burst, self.tokens + 1)
+
+    def backoff(self, retry_after: Optional[float] = None):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.base_rate * MIN_RATE_FRACTION, self.rate * BACKOFF_FACTOR)
+            self.backoffs += 1
+            if retry_after:
+                # Refill starts when the block ends: the first request goes then, the rest
+                # (already queued ones included, they hold negative tokens) follow at the rate
+                self.updated = max(self.updated, now + min(retry_after, MAX_RETRY_AFTER_SECONDS))
+                self.tokens = min(self.tokens, 1.0)
+
+    def recover(self):
+        if self.rate >= self.base_rate:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = min(self.base_rate, self.rate + self.base_rate * RECOVERY_FRACTION)
+
+    def stats(self) -> dict:
+        return {
+            "rate": round(self.rate, 3),
+            "base_rate": self.base_rate,
+            "burst": self.burst,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "waited_s": round(self.waited, 1),
+            "backoffs": self.backoffs,
+        }
+
+
+class HostRateLimiter:
+    """
+    One token bucket per host, shared by every scrape in the process.
+
+    Scrapers reserve a token before each request (BaseScraper.throttle / athrottle)
+    instead of sleeping a fixed time: a host that has been quiet is hit right
+    away, up to its burst, and concurrent searches on the same host share its rate.
+    Responses feed back: 429/503 halve the host's rate (and honour Retry-After),
+    successes bring it back up step by step (AIMD), so each site runs as fast as
+    it tolerates.
+    """
+
+    def __init__(self, limits: Dict[str, Tuple[float, int]] = None):
+        self.limits = limits if limits is not None else _parse_host_limits(os.getenv("SCRAPER_HOST_LIMITS", ""))
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, url: str) -> Tuple[str, Tuple[float, int]]:
+        host = (urlsplit(url).hostname or "").lower()
+        for domain, limit in self.limits.items():
+            if host == domain or host.endswith("." + domain):
+                return domain, limit
+        return host, (SCRAPER_HOST_RATE, SCRAPER_HOST_BURST)
+
+    def bucket(self, url: str) -> TokenBucket:
+        key, (rate, burst) = self._key(url)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = TokenBucket(rate, burst)
+                    self._buckets[key] = bucket
+        return bucket
+
+    def record(self, url: str, status_code: int, retry_after: Optional[str] = None):
+        """Feed a response back into its host's rate."""
+        bucket = self.bucket(url)
+        if status_code in (429, 503):
+            seconds = None
+            if retry_after:
+                try:
+                    seconds = float(retry_after)
+                except ValueError:
+                    pass  # HTTP-date form, the rate cut alone will do
+            bucket.backoff(seconds)
+            logger.warning(f"{url.split('?')[0]} answered {status_code}, slowing its host to {bucket.rate:.2f} req/s")
+        elif status_code < 400:
+            bucket.recover()
+
+    def stats(self) -> dict:
+        return {host: bucket.stats() for host, bucket in self._buckets.items()}
+
+
+rate_limiter = HostRateLimiter()
@@ -0,0 +1,253 @@
+import argparse
+import importlib
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from app.scrapers.base import BaseScraper
+
+logger = logging.getLogger("ScraperRegistry")
+
+# Site name (as sent by the frontend) -> "module:Class", in the order searches run them.
+# Modules are imported the first time a site is requested, so selenium, tls_client,
+# BeautifulSoup and friends stay out of the API worker until a search needs them.
+SCRAPER_MODULES = {
+    "google": "app.scrapers.google:GoogleScraper",
+    "linkedin": "app.scrapers.linkedin:LinkedInScraper",
+    "indeed": "app.scrapers.indeed:IndeedScraper",
+    "glassdoor": "app.scrapers.glassdoor:GlassdoorScraper",
+    "ziprecruiter": "app.scrapers.ziprecruiter:ZipRecruiterScraper",
+    "bayt": "app.scrapers.bayt:BaytScraper",
+    "naukri": "app.scrapers.naukri:NaukriScraper",
+    "adzuna": "app.scrapers.adzuna:AdzunaScraper",
+    "remotive": "app.scrapers.remotive:RemotiveScraper",
+    "himalayas": "app.scrapers.himalayas:HimalayasScraper",
+    "jobicy": "app.scrapers.jobicy:JobicyScraper",
+    "weworkremotely": "app.scrapers.weworkremotely:WeWorkRemotelyScraper",
+    "talent.com": "app.scrapers.talent:TalentScraper",
+    "jobspresso": "app.scrapers.jobspresso:JobspressoScraper",
+    "jora": "app.scrapers.jora:JoraScraper",
+    "remote.co": "app.scrapers.remoteco:RemoteCoScraper",
+    "workingnomads": "app.scrapers.workingnomads:WorkingNomadsScraper",
+    "justremote": "app.scrapers.justremote:JustRemoteScraper",
+    "powertofly": "app.scrapers.powertofly:PowerToFlyScraper",
+    "remoteleaf": "app.scrapers.remoteleaf:RemoteLeafScraper",
+    "peopleperhour": "app.scrapers.peopleperhour:PeoplePerHourScraper",
+    "guru": "app.scrapers.guru:GuruScraper",
+    "truelancer": "app.scrapers.truelancer:TruelancerScraper",
+    "builtin": "app.scrapers.builtin:BuiltInScraper",
+    "arc": "app.scrapers.arc:ArcScraper",
+    # NEW working scrapers (Phase 3)
+    "dice": "app.scrapers.dice:DiceScraper",
+    "skipthedrive": "app.scrapers.skipthedrive:SkipTheDriveScraper",
+    "themuse": "app.scrapers.themuse:TheMuseScraper",
+}
+
+SITE_ALIASES = {
+    "muse": "themuse",
+}
+
+# Idle instances kept warm per site (roughly the number of concurrent scrapes per site)
+SCRAPER_POOL_SIZE = int(os.getenv("SCRAPER_POOL_SIZE", 4))
+# Warn when importing a single scraper module takes longer than this
+SCRAPER_IMPORT_BUDGET_MS = float(os.getenv("SCRAPER_IMPORT_BUDGET_MS", 500))
+
+
+class ScraperRegistry:
+    """
+    Process-wide pool of warm scraper instances.
+
+    Building a scraper is not free (fresh tls_client session and TLS handshakes,
+    ZipRecruiter's cookie POST), and a session must not be used by two threads at
+    once. Each site keeps up to `pool_size` idle instances; a scrape leases one,
+    uses it exclusively, and hands it back for the next search.
+    """
+
+    def __init__(self, pool_size: int = SCRAPER_POOL_SIZE):
+        self.pool_size = pool_size
+        self._classes: Dict[str, type] = {}
+        self._import_ms: Dict[str, float] = {}
+        self._idle: Dict[str, List[BaseScraper]] = {}
+        self._shared: Dict[str, BaseScraper] = {}
+        self._created: Dict[str, int] = {}
+        self._leased: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def resolve_sites(self, sites: List[str]) -> List[str]:
+        """
+        Map requested site names to registry keys, dropping unknown ones.
+        """
+        wanted = set()
+        for site in sites:
+            site = site.strip().lower()
+            wanted.add(SITE_ALIASES.get(site, site))
+        return [site for site in SCRAPER_MODULES if site in wanted]
+
+    def scraper_class(self, site: str) -> type:
+        """
+        Return the scraper class for `site`, importing its module on first use.
+        """
+        cls = self._classes.get(site)
+        if cls is not None:
+            return cls
+
+        module_name, class_name = SCRAPER_MODULES[site].split(":")
+        # Import lock is per module, so two threads asking for the same site just wait
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        cls = getattr(module, class_name)
+
+        with self._lock:
+            if site not in self._classes:
+                self._classes[site] = cls
+                self._import_ms[site] = elapsed_ms
+        if elapsed_ms > SCRAPER_IMPORT_BUDGET_MS:
+            logger.warning(f"Importing {module_name} took {elapsed_ms:.0f}ms (budget {SCRAPER_IMPORT_BUDGET_MS:.0f}ms)")
+        else:
+            logger.info(f"Imported {module_name} in {elapsed_ms:.0f}ms")
+        return cls
+
+    def import_report(self) -> Dict[str, float]:
+        """
+        Milliseconds spent importing each scraper loaded so far. A module that shares
+        heavy dependencies with one imported earlier shows only its own cost.
+        """
+        with self._lock:
+            return dict(self._import_ms)
+
+    def shared(self, site: str) -> BaseScraper:
+        """
+        One instance per site for native async scrapers. They keep no per-request
+        state and talk through the shared HTTP client, so every search can use it.
+        """
+        scraper = self._shared.get(site)
+        if scraper is None:
+            cls = self.scraper_class(site)
+            with self._lock:
+                scraper = self._shared.get(site)
+                if scraper is None:
+                    scraper = cls()
+                    self._shared[site] = scraper
+                    self._created[site] = self._created.get(site, 0) + 1
+        return scraper
+
+    @contextmanager
+    def lease(self, site: str):
+        """
+        Borrow a scraper for `site`. Blocking (may build a new instance), so call it
+        from a worker thread.
+        """
+        scraper = self._checkout(site)
+        healthy = False
+        try:
+            yield scraper
+            healthy = True
+        finally:
+            self._checkin(site, scraper, healthy)
+
+    def _checkout(self, site: str) -> BaseScraper:
+        with self._lock:
+            self._leased[site] = self._leased.get(site, 0) + 1
+            idle = self._idle.get(site)
+            if idle:
+                return idle.pop()
+
+        try:
+            # Build outside the lock, construction may hit the network
+            scraper = self.scraper_class(site)()
+        except Exception:
+            with self._lock:
+                self._leased[site] -= 1
+            raise
+
+        with self._lock:
+            self._created[site] = self._created.get(site, 0) + 1
+        logger.info(f"Created scraper instance for {site}")
+        return scraper
+
+    def _checkin(self, site: str, scraper: BaseScraper, healthy: bool):
+        with self._lock:
+            self._leased[site] -= 1
+            idle = self._idle.setdefault(site, [])
+            # An instance whose scrape blew up may have a broken session, don't reuse it
+            if healthy and len(idle) < self.pool_size:
+                idle.append(scraper)
+                return
+        self._close(scraper)
+
+    def _close(self, scraper: BaseScraper):
+        # Only blocking scrapers ever open a tls_client session
+        close = getattr(scraper._session, "close", None)
+        if close:
+            try:
+                close()
+            except Exception as e:
+                logger.warning(f"Error closing {scraper.site_name} session: {e}")
+
+    def close_all(self):
+        """Close every idle session (leased ones are closed when returned)."""
+        with self._lock:
+            idle = [s for scrapers in self._idle.values() for s in scrapers]
+            self._idle.clear()
+            self.pool_size = 0
+        for scraper in idle:
+            self._close(scraper)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {
+                site: {
+                    "created": self._created.get(site, 0),
+                    "idle": len(self._idle.get(site, [])),
+                    "leased": self._leased.get(site, 0),
+                }
+                for site in SCRAPER_MODULES
+                if site in self._created
+            }
+
+
+registry = ScraperRegistry()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Import-time report: python -m app.scrapers.registry [--budget-ms N] [--sites a,b]
+
+    Run it in a fresh interpreter. It times the API import (what a worker pays
+    before it can serve a request) and then every scraper module, and exits
+    non-zero when the API import exceeds the budget.
+    """
+    parser = argparse.ArgumentParser(description="Report backend and scraper import times")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail if importing app.main takes longer")
+    parser.add_argument("--sites", type=str, default=None, help="Comma separated sites (default: all)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    importlib.import_module("app.main")
+    app_ms = (time.perf_counter() - start) * 1000
+    print(f"{'app.main (cold start)':<30} {app_ms:>8.0f} ms")
+
+    sites = registry.resolve_sites(args.sites.split(",")) if args.sites else list(SCRAPER_MODULES)
+    for site in sites:
+        try:
+            registry.scraper_class(site)
+        except Exception as e:
+            print(f"{site:<30} {'FAILED':>8}    {e}")
+    report = registry.import_report()
+    for site, ms in sorted(report.items(), key=lambda item: item[1], reverse=True):
+        print(f"{site:<30} {ms:>8.0f} ms")
+    print(f"{'scrapers total':<30} {sum(report.values()):>8.0f} ms")
+
+    if args.budget_ms is not None and app_ms > args.budget_ms:
+        print(f"app.main import exceeds budget: {app_ms:.0f}ms > {args.budget_ms:.0f}ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
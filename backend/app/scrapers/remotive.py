@@ -9,7 +9,7 @@ class RemotiveScraper(BaseScraper):
         super().__init__("Remotive", proxies)
         self.base_url = "https://remotive.com/api/remote-jobs"
 
-    def scrape(self, input_data: ScraperInput) -> List[JobPost]:
+    async def ascrape(self, input_data: ScraperInput) -> List[JobPost]:
         job_posts = []
         
         # Remotive has limited filtering via API: category, company_name, search, limit
@@ -25,7 +25,7 @@ class RemotiveScraper(BaseScraper):
         # The docs say "limit" is supported.
         
         try:
-            response = self.safe_get(self.base_url, params=params)
+            response = await self.asafe_get(self.base_url, params=params)
             if response.status_code != 200:
                 self.logger.error(f"Failed to fetch Remotive jobs: {response.status_code}")
                 return []
@@ -8,7 +8,7 @@ class TheMuseScraper(BaseScraper):
         super().__init__("The Muse", proxies)
         self.base_url = "https://www.themuse.com/api/public/jobs"
 
-    def scrape(self, input_data: ScraperInput) -> List[JobPost]:
+    async def ascrape(self, input_data: ScraperInput) -> List[JobPost]:
         job_posts = []
         
         params = {
@@ -19,7 +19,7 @@ class TheMuseScraper(BaseScraper):
         }
         
         try:
-            response = self.safe_get(self.base_url, params=params)
+            response = await self.asafe_get(self.base_url, params=params)
             if response.status_code != 200:
                 self.logger.error(f"Failed to fetch The Muse jobs: {response.status_code}")
                 return []
@@ -1,11 +1,9 @@
 import logging
-import time
-import random
 import json
 from typing import List, Optional, Tuple
 from datetime import datetime
 
-from app.scrapers.base import BaseScraper, ScraperError
+from app.scrapers.base import BaseScraper, ScraperError, ScrapeCancelled
 from app.models.job import JobPost, ScraperInput, JobType
 
 # Constants
@@ -66,7 +64,11 @@ class ZipRecruiterScraper(BaseScraper):
             # Original code: self.session.post(url, data=get_cookie_data)
             
             # Simple init
-            self.session.post(f"{self.api_url}/jobs-app/event", data={"event_type": "session"})
+            url = f"{self.api_url}/jobs-app/event"
+            self.throttle(url)
+            self.record(url, self.session.post(url, data={"event_type": "session"}))
+        except ScrapeCancelled:
+            raise
         except Exception as e:
             self.logger.warning(f"Cookie init failed: {e}")
 
@@ -79,6 +81,8 @@ class ZipRecruiterScraper(BaseScraper):
         for page in range(1, 10):
             if len(jobs) >= input_data.results_wanted:
                 break
+            if self.cancelled:
+                break
                 
             self.logger.debug(f"Fetching page {page}")
             
@@ -93,7 +97,10 @@ class ZipRecruiterScraper(BaseScraper):
                 if continue_token:
                     params["continue_from"] = continue_token
                 
-                response = self.session.get(f"{self.api_url}/jobs-app/jobs", params=params)
+                url = f"{self.api_url}/jobs-app/jobs"
+                self.throttle(url)
+                response = self.session.get(url, params=params)
+                self.record(url, response)
                 if response.status_code != 200:
                      self.logger.error(f"ZR Error: {response.status_code}")
                      break
@@ -113,9 +120,9 @@ class ZipRecruiterScraper(BaseScraper):
                         
                 if not continue_token:
                     break
-                    
-                time.sleep(random.uniform(2, 4))
-                
+
+            except ScrapeCancelled:
+                raise
             except Exception as e:
                 self.logger.error(f"Scrape error: {e}")
                 break
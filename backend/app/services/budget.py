@@ -0,0 +1,74 @@
+import math
+from typing import Dict, List, Tuple
+
+from app.services.planner import planner, PlannedScrape
+
+# Jobs a site returns per request. Asking for less than a page costs the same
+# request, so budgets are rounded up to whole pages.
+SITE_PAGE_SIZES = {
+    "linkedin": 10,
+    "indeed": 100,
+    "glassdoor": 30,
+    "ziprecruiter": 20,
+    "naukri": 20,
+    "bayt": 20,
+    "adzuna": 20,
+    "jora": 10,
+    "talent.com": 10,
+    "dice": 50,
+    "jobicy": 50,
+    "themuse": 20,
+    # One request returns the whole feed, whatever is asked for
+    "remotive": 100,
+    "himalayas": 100,
+    "weworkremotely": 100,
+    "skipthedrive": 100,
+}
+DEFAULT_PAGE_SIZE = 20
+
+
+def page_size(site: str) -> int:
+    return SITE_PAGE_SIZES.get(site, DEFAULT_PAGE_SIZE)
+
+
+class PassBudget:
+    """
+    Splits the results a pass still needs across its (site, query) scrapes.
+
+    Each scrape's share is weighted by how much of what it's asked for the site
+    usually delivers (planner fill ratio), and is taken when the scrape actually
+    starts, so scrapes waiting on the search's concurrency limit pick up what
+    earlier ones left over: a scrape that comes back short (site ran dry, failed)
+    hands the rest of its share back, one that over-delivers shrinks the pool.
+    What a scrape is asked for is rounded up to whole pages of its site.
+    """
+
+    def __init__(self, total: int, planned: List[PlannedScrape], country: str):
+        self.total = total
+        self._left = float(total)
+        self._weights: Dict[Tuple[str, str], float] = {}
+        for p in planned:
+            self._weights[(p.site, p.query)] = max(planner.fill_ratio(p.site, p.qclass, country), 0.05)
+        self._pending = set(self._weights)
+        self._shares: Dict[Tuple[str, str], float] = {}
+
+    def take(self, site: str, query: str) -> int:
+        """
+        Budget for a scrape that is starting now, in results to ask the site for.
+        """
+        key = (site, query)
+        pending_weight = sum(self._weights[k] for k in self._pending) or 1.0
+        share = self._left * self._weights.get(key, 1.0) / pending_weight
+        self._pending.discard(key)
+        self._left = max(0.0, self._left - share)
+        self._shares[key] = share
+
+        size = page_size(site)
+        return max(1, math.ceil(share / size)) * size
+
+    def finish(self, site: str, query: str, got: int):
+        """
+        Settle a finished scrape against its share.
+        """
+        share = self._shares.pop((site, query), 0.0)
+        self._left = max(0.0, self._left + share - got)
@@ -0,0 +1,217 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.job import JobPost
+
+logger = logging.getLogger("ResultCache")
+
+# Seconds a site's results are reused for identical scrapes (0 disables caching)
+RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", 300))
+# Cached scrapes kept in memory before the least recently used are evicted
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", 1000))
+
+# Seconds a scrape that came back empty is skipped for identical queries
+NEGATIVE_CACHE_TTL = int(os.getenv("NEGATIVE_CACHE_TTL", 120))
+
+# Per-site overrides, e.g. RESULT_CACHE_SITE_TTLS="linkedin:600,indeed:120"
+DEFAULT_SITE_TTLS = {
+    # Feeds of remote boards change a few times a day
+    "remotive": 900,
+    "himalayas": 900,
+    "jobicy": 900,
+    "weworkremotely": 900,
+}
+
+
+def _parse_site_ttls(value: str) -> Dict[str, int]:
+    ttls = dict(DEFAULT_SITE_TTLS)
+    for item in value.split(","):
+        if ":" not in item:
+            continue
+        site, ttl = item.split(":", 1)
+        try:
+            ttls[site.strip().lower()] = max(0, int(ttl))
+        except ValueError:
+            logger.warning(f"Ignoring bad RESULT_CACHE_SITE_TTLS entry: {item}")
+    return ttls
+
+
+class CacheBackend:
+    """
+    Storage behind ResultCache. Keys are strings; a shared backend (Redis,
+    memcached) has to serialize values itself and honour the TTL.
+    """
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: int):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """
+    Size-bounded LRU dict local to this worker process.
+    """
+
+    def __init__(self, max_entries: int = RESULT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: int):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class _CachedScrape:
+    def __init__(self, results_wanted: int, jobs: List[JobPost]):
+        self.results_wanted = results_wanted
+        self.jobs = jobs
+
+
+class ResultCache:
+    """
+    Reuses a site's results for identical scrapes (see singleflight.scrape_key).
+
+    An entry answers a later scrape when it was fetched for at least as many
+    results, or when the site ran out before reaching what was asked for.
+    Empty results are not cached here, a failed scrape looks the same.
+
+    The default MemoryBackend only serves searches of this process; pass a
+    shared CacheBackend to reuse results across API processes.
+    """
+
+    def __init__(self, backend: CacheBackend = None, default_ttl: int = RESULT_CACHE_TTL, site_ttls: Dict[str, int] = None):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.default_ttl = default_ttl
+        self.site_ttls = site_ttls if site_ttls is not None else _parse_site_ttls(os.getenv("RESULT_CACHE_SITE_TTLS", ""))
+
+        # Metrics
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+
+    def ttl(self, site: str) -> int:
+        return self.site_ttls.get(site, self.default_ttl)
+
+    @staticmethod
+    def _key(key: tuple) -> str:
+        return "|".join(str(part) for part in key)
+
+    def get(self, key: tuple, results_wanted: int) -> Optional[List[JobPost]]:
+        site = key[0]
+        if self.ttl(site) <= 0:
+            return None
+        entry = self.backend.get(self._key(key))
+        if entry is None or (entry.results_wanted < results_wanted and len(entry.jobs) >= entry.results_wanted):
+            self.misses[site] = self.misses.get(site, 0) + 1
+            return None
+        self.hits[site] = self.hits.get(site, 0) + 1
+        # Every search scores its own copies
+        return [job.model_copy() for job in entry.jobs[:results_wanted]]
+
+    def put(self, key: tuple, results_wanted: int, jobs: List[JobPost]):
+        ttl = self.ttl(key[0])
+        if ttl <= 0 or not jobs:
+            return
+        self.backend.set(self._key(key), _CachedScrape(results_wanted, [job.model_copy() for job in jobs]), ttl)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        hits = sum(self.hits.values())
+        misses = sum(self.misses.values())
+        return {
+            "entries": len(self.backend),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+            "evictions": getattr(self.backend, "evictions", 0),
+            "sites": {
+                site: {"hits": self.hits.get(site, 0), "misses": self.misses.get(site, 0), "ttl": self.ttl(site)}
+                for site in sorted(set(self.hits) | set(self.misses))
+            },
+        }
+
+
+class NegativeCache:
+    """
+    Remembers scrapes that returned nothing, so narrow queries from later passes
+    (single skills) aren't sent again to a site that just had no jobs for them.
+
+    The TTL is short on purpose: a scraper that failed quietly returns an empty
+    list too, and that shouldn't hide the site for long. Kept in this
+    process's memory.
+    """
+
+    def __init__(self, backend: CacheBackend = None, ttl: int = NEGATIVE_CACHE_TTL):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.ttl = ttl
+
+        # Metrics
+        self.recorded = 0
+        self.avoided: Dict[str, int] = {}
+
+    def is_empty(self, key: tuple) -> bool:
+        if self.ttl <= 0 or self.backend.get(ResultCache._key(key)) is None:
+            return False
+        site = key[0]
+        self.avoided[site] = self.avoided.get(site, 0) + 1
+        return True
+
+    def mark_empty(self, key: tuple):
+        if self.ttl <= 0:
+            return
+        self.backend.set(ResultCache._key(key), True, self.ttl)
+        self.recorded += 1
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self.backend),
+            "ttl": self.ttl,
+            "recorded": self.recorded,
+            "avoided": sum(self.avoided.values()),
+            "sites": dict(sorted(self.avoided.items())),
+        }
+
+
+result_cache = ResultCache()
+negative_cache = NegativeCache()
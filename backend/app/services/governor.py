@@ -0,0 +1,318 @@
+import asyncio
+import contextvars
+import functools
+import heapq
+import itertools
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Dict, List
+
+logger = logging.getLogger("ScrapeGovernor")
+
+# Scrapes running at once across every search in this process
+SCRAPER_MAX_CONCURRENCY = int(os.getenv("SCRAPER_MAX_CONCURRENCY", 16))
+# Default scrapes running at once against a single site
+SCRAPER_SITE_CONCURRENCY = int(os.getenv("SCRAPER_SITE_CONCURRENCY", 4))
+# Scrapes allowed to wait for a slot before new ones are turned away
+SCRAPER_MAX_QUEUED = int(os.getenv("SCRAPER_MAX_QUEUED", 200))
+
+# Global slots background scrapes may never take, kept free for interactive searches
+SCRAPER_INTERACTIVE_RESERVE = int(os.getenv("SCRAPER_INTERACTIVE_RESERVE", max(1, SCRAPER_MAX_CONCURRENCY // 4)))
+
+# Scrape priorities, lower goes first. Interactive: a user is watching a search
+# stream. Background: bulk or scheduled work that only fills idle capacity.
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+PRIORITIES = {INTERACTIVE: 0, BACKGROUND: 1}
+
+# Recent slot waits kept per priority for the latency percentiles
+LATENCY_SAMPLES = 1000
+
+# Per-site overrides, e.g. SCRAPER_SITE_LIMITS="guru:1,linkedin:2"
+DEFAULT_SITE_LIMITS = {
+    "guru": 1,  # Launches a headless Chrome per scrape
+    "linkedin": 2,
+    "glassdoor": 2,
+}
+
+
+def _parse_site_limits(value: str) -> Dict[str, int]:
+    limits = dict(DEFAULT_SITE_LIMITS)
+    for item in value.split(","):
+        if ":" not in item:
+            continue
+        site, limit = item.split(":", 1)
+        try:
+            limits[site.strip().lower()] = max(1, int(limit))
+        except ValueError:
+            logger.warning(f"Ignoring bad SCRAPER_SITE_LIMITS entry: {item}")
+    return limits
+
+
+class GovernorBusy(Exception):
+    pass
+
+
+class PrioritySemaphore:
+    """
+    Semaphore handing free slots to waiters by priority, then by weighted fair
+    queuing between users.
+
+    Background waiters also leave `reserve` slots free, so an interactive scrape
+    arriving at a busy moment still finds one. Nothing running is interrupted:
+    interactive scrapes only jump ahead of queued background ones.
+
+    Within a priority each acquire gets a virtual finish tag (self-clocked fair
+    queuing): the later of the current virtual time and the user's previous
+    tag, plus 1/weight; the virtual time is the tag last served. Waiters are
+    served in tag order, so a user with many scrapes queued takes turns with
+    everyone else instead of going first. Acquires without a user are tagged
+    at the current virtual time.
+    """
+
+    def __init__(self, value: int, reserve: int = 0):
+        self._value = value
+        self.reserve = min(reserve, max(0, value - 1))
+        self._waiters: List[list] = []  # Heap of [priority, tag, seq, future]
+        self._seq = itertools.count()
+        self._vtime = 0.0
+        self._user_tags: Dict[object, float] = {}
+
+    def _tag(self, user, weight: float) -> float:
+        if user is None:
+            return self._vtime
+        tag = max(self._vtime, self._user_tags.get(user, 0.0)) + 1.0 / weight
+        self._user_tags[user] = tag
+        if len(self._user_tags) > 1000:
+            # Users at or behind the virtual time would restart from it anyway
+            self._user_tags = {u: t for u, t in self._user_tags.items() if t > self._vtime}
+        return tag
+
+    def _can_take(self, priority: int) -> bool:
+        free = self._value if priority == 0 else self._value - self.reserve
+        return free > 0
+
+    def _head(self):
+        # Drop waiters that gave up
+        while self._waiters and self._waiters[0][3].done():
+            heapq.heappop(self._waiters)
+        return self._waiters[0] if self._waiters else None
+
+    def try_acquire(self, priority: int = 0) -> bool:
+        """Take a slot only if one is free right now and nobody as urgent is waiting for it."""
+        head = self._head()
+        if (head is None or head[0] > priority) and self._can_take(priority):
+            self._value -= 1
+            return True
+        return False
+
+    async def acquire(self, priority: int = 0, user=None, weight: float = 1.0):
+        tag = self._tag(user, weight)
+        head = self._head()
+        if (head is None or head[0] > priority) and self._can_take(priority):
+            self._value -= 1
+            self._vtime = max(self._vtime, tag)
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, [priority, tag, next(self._seq), future])
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Handed a slot just as we were cancelled, pass it on
+                self.release()
+            raise
+
+    def release(self):
+        self._value += 1
+        self._wake()
+
+    def _wake(self):
+        while True:
+            head = self._head()
+            # Heap order: a background head means no interactive scrape is waiting
+            if head is None or not self._can_take(head[0]):
+                return
+            heapq.heappop(self._waiters)
+            self._value -= 1
+            self._vtime = max(self._vtime, head[1])
+            head[3].set_result(True)
+
+
+class _PriorityStats:
+    def __init__(self):
+        self.waiting = 0
+        self.running = 0
+        self.admitted = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+        self.finished = 0
+        self.recent_waits = deque(maxlen=LATENCY_SAMPLES)
+
+    def to_dict(self) -> dict:
+        waits = sorted(self.recent_waits)
+
+        def percentile(q: float) -> float:
+            return round(waits[min(len(waits) - 1, int(q * len(waits)))] * 1000, 1) if waits else 0.0
+
+        return {
+            "waiting": self.waiting,
+            "running": self.running,
+            "admitted": self.admitted,
+            "avg_wait_ms": round(self.total_wait / self.admitted * 1000, 1) if self.admitted else 0.0,
+            "p50_wait_ms": percentile(0.5),
+            "p95_wait_ms": percentile(0.95),
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+            "avg_run_ms": round(self.total_run / self.finished * 1000, 1) if self.finished else 0.0,
+        }
+
+
+class ScrapeGovernor:
+    """
+    Process-wide admission control for scrapes.
+
+    Every scrape holds a per-site slot and a global slot, and runs on the
+    governor's own thread pool instead of the event loop's default executor, so
+    slow scrapers can't starve unrelated to_thread work. When too many scrapes are
+    already queued new ones are rejected with GovernorBusy instead of piling up.
+
+    Slots go to interactive scrapes before queued background ones, and background
+    scrapes never take the last SCRAPER_INTERACTIVE_RESERVE global slots, nor the
+    last quarter (at least one) of a site's slots when it has more than one.
+    A scrape never holds one slot while waiting for the other, so queued
+    background scrapes can't block an interactive one through either.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = SCRAPER_MAX_CONCURRENCY,
+        site_concurrency: int = SCRAPER_SITE_CONCURRENCY,
+        max_queued: int = SCRAPER_MAX_QUEUED,
+        site_limits: Dict[str, int] = None,
+        interactive_reserve: int = SCRAPER_INTERACTIVE_RESERVE,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.site_concurrency = max(1, site_concurrency)
+        self.max_queued = max_queued
+        self.site_limits = site_limits if site_limits is not None else _parse_site_limits(os.getenv("SCRAPER_SITE_LIMITS", ""))
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="scraper")
+
+        self._global = PrioritySemaphore(self.max_concurrency, reserve=interactive_reserve)
+        self._sites: Dict[str, PrioritySemaphore] = {}
+
+        # Metrics
+        self.waiting = 0
+        self.running = 0
+        self.site_running: Dict[str, int] = {}
+        self.admitted = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.priorities = {name: _PriorityStats() for name in PRIORITIES}
+
+    def _site_semaphore(self, site: str) -> PrioritySemaphore:
+        sem = self._sites.get(site)
+        if sem is None:
+            limit = self.site_limits.get(site, self.site_concurrency)
+            sem = PrioritySemaphore(limit, reserve=max(1, limit // 4) if self._global.reserve else 0)
+            self._sites[site] = sem
+        return sem
+
+    @asynccontextmanager
+    async def slot(self, site: str, priority: str = INTERACTIVE, user=None, weight: float = 1.0):
+        """
+        Hold a global and a per-site slot for the duration of one scrape.
+        `user` (and its fair-queuing weight) shares queued slots fairly between users.
+        """
+        if self.waiting >= self.max_queued:
+            self.rejected += 1
+            raise GovernorBusy(f"{self.waiting} scrapes already queued")
+
+        rank = PRIORITIES[priority]
+        stats = self.priorities[priority]
+        site_sem = self._site_semaphore(site)
+        start = time.monotonic()
+        self.waiting += 1
+        stats.waiting += 1
+        try:
+            # Wait for one slot while holding nothing, then take the other only if it is
+            # free right now; otherwise give the first back and wait for the second
+            while True:
+                await site_sem.acquire(rank, user, weight)
+                if self._global.try_acquire(rank):
+                    break
+                site_sem.release()
+                await self._global.acquire(rank, user, weight)
+                if site_sem.try_acquire(rank):
+                    break
+                self._global.release()
+        finally:
+            self.waiting -= 1
+            stats.waiting -= 1
+
+        waited = time.monotonic() - start
+        self.admitted += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        stats.admitted += 1
+        stats.total_wait += waited
+        stats.max_wait = max(stats.max_wait, waited)
+        stats.recent_waits.append(waited)
+        if waited > 5 and priority == INTERACTIVE:
+            logger.info(f"{site} scrape waited {waited:.1f}s for a slot")
+
+        self.running += 1
+        stats.running += 1
+        self.site_running[site] = self.site_running.get(site, 0) + 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.running -= 1
+            stats.running -= 1
+            stats.finished += 1
+            stats.total_run += time.monotonic() - started
+            self.site_running[site] -= 1
+            self._global.release()
+            site_sem.release()
+
+    async def run_in_thread(self, func, *args):
+        """
+        asyncio.to_thread on the governor's pool, keeping contextvars (cancel events).
+        """
+        loop = asyncio.get_running_loop()
+        ctx = contextvars.copy_context()
+        return await loop.run_in_executor(self.executor, functools.partial(ctx.run, func, *args))
+
+    def close(self):
+        """Wait for the scraper threads to finish (shutdown, after their scrapes were cancelled)."""
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "running": self.running,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.total_wait / self.admitted * 1000, 1) if self.admitted else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+            "interactive_reserve": self._global.reserve,
+            "priorities": {name: stats.to_dict() for name, stats in self.priorities.items()},
+            "sites": {
+                site: {
+                    "running": running,
+                    "limit": self.site_limits.get(site, self.site_concurrency),
+                    "interactive_reserve": self._sites[site].reserve,
+                }
+                for site, running in self.site_running.items()
+            },
+        }
+
+
+governor = ScrapeGovernor()
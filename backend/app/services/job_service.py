@@ -1,48 +1,47 @@
 import asyncio
 import json
+import math
 import logging
+import os
 import random
-from typing import List, Set, Dict, Any
+import time
+from typing import List, Set, Dict, Any, Callable, Awaitable
 from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 
-from sqlmodel import Session, select
+from datetime import date, datetime, timedelta
+
+from sqlmodel import Session, select, col
 from app.db.models import Job
 from app.models.job import ScraperInput, JobPost, JobType
-
-# Import Scrapers
-from app.scrapers.google import GoogleScraper
-from app.scrapers.linkedin import LinkedInScraper
-from app.scrapers.indeed import IndeedScraper
-from app.scrapers.glassdoor import GlassdoorScraper
-from app.scrapers.ziprecruiter import ZipRecruiterScraper
-from app.scrapers.bayt import BaytScraper
-from app.scrapers.naukri import NaukriScraper
-from app.scrapers.adzuna import AdzunaScraper
-from app.scrapers.remotive import RemotiveScraper
-from app.scrapers.himalayas import HimalayasScraper
-from app.scrapers.jobicy import JobicyScraper
-from app.scrapers.weworkremotely import WeWorkRemotelyScraper
-from app.scrapers.talent import TalentScraper
-from app.scrapers.jobspresso import JobspressoScraper
-from app.scrapers.jora import JoraScraper
-from app.scrapers.remoteco import RemoteCoScraper
-from app.scrapers.workingnomads import WorkingNomadsScraper
-from app.scrapers.justremote import JustRemoteScraper
-from app.scrapers.powertofly import PowerToFlyScraper
-from app.scrapers.remoteleaf import RemoteLeafScraper
-from app.scrapers.peopleperhour import PeoplePerHourScraper
-from app.scrapers.guru import GuruScraper
-from app.scrapers.truelancer import TruelancerScraper
-from app.scrapers.builtin import BuiltInScraper
-from app.scrapers.arc import ArcScraper
-# NEW working scrapers (Phase 3)
-from app.scrapers.dice import DiceScraper
-from app.scrapers.skipthedrive import SkipTheDriveScraper
-from app.scrapers.themuse import TheMuseScraper
+from app.scrapers.registry import registry
+from app.services.governor import governor, GovernorBusy, INTERACTIVE
+from app.services.singleflight import singleflight, scrape_key
+from app.services.cache import result_cache, negative_cache
+from app.services.planner import planner, query_class, PLANNER_HEADROOM
+from app.services.budget import PassBudget
+from app.services.result_queue import ResultQueue
+from app.services.ranking import TopK
+from app.services.site_selector import expand_sites
+from app.services.worker_pool import process_pool, SCRAPER_ISOLATION
+from app.services.scrape_queue import scrape_queue
+from app.services.quotas import user_quotas, QuotaExceeded, USER_MAX_SCRAPES, USER_SEARCH_QUEUE_SECONDS
+from app.services.shutdown import search_drain
 
 
 logger = logging.getLogger("JobService")
 
+# Max (query x site) scrapes a single search runs at once in fan-out mode
+SEARCH_CONCURRENCY = int(os.getenv("SEARCH_CONCURRENCY", 8))
+# How often a waiting search checks whether its client is still connected
+DISCONNECT_POLL_SECONDS = 1.0
+# Share of results_wanted the stored Job table may fill before live scrapers run
+LOCAL_RESULTS_SHARE = float(os.getenv("LOCAL_RESULTS_SHARE", 0.5))
+# Stored jobs older than this aren't offered, they are likely filled or expired
+LOCAL_RESULTS_MAX_AGE_DAYS = int(os.getenv("LOCAL_RESULTS_MAX_AGE_DAYS", 30))
+# Returned by JobService._next_item when the search deadline has passed
+DEADLINE_REACHED = object()
+
 def generate_search_queries(resume: dict, user_search_term: str, pass_num: int = 1) -> List[str]:
     """
     Generate search queries based on resume and pass number.
@@ -141,6 +140,35 @@ def calculate_match_score(job: JobPost, resume: dict) -> float:
     return min(score, 100.0)
 
 
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {"refid", "trackingid", "position", "pagenum", "from", "src", "source", "ref", "fbclid", "gclid"}
+
+def normalize_job_url(url: str) -> str:
+    """
+    Canonical form of a posting URL: lowercase host without www, no fragment,
+    no tracking parameters, no trailing slash.
+    """
+    parts = urlsplit((url or "").strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    ]
+    return urlunsplit(("", host, parts.path.rstrip("/"), urlencode(sorted(query)), ""))
+
+def job_identities(job: JobPost) -> List[tuple]:
+    """
+    Keys under which a posting counts as already seen: the site's own job id when
+    the scraper sets one, and the normalized URL.
+    """
+    site = (job.site or "").lower()
+    keys = [(site, normalize_job_url(job.job_url))]
+    if job.id:
+        keys.append((site, job.id))
+    return keys
+
 class JobService:
     @staticmethod
     async def stream_search_jobs(
@@ -156,7 +184,15 @@ class JobService:
         hours_old: int = None,
         job_type: List[str] = None,
         offset: int = 0,
-        session: Session = None
+        session: Session = None,
+        fan_out: bool = True,
+        concurrency: int = None,
+        is_disconnected: Callable[[], Awaitable[bool]] = None,
+        dry_run: bool = False,
+        deadline_ms: int = None,
+        include_stored: bool = True,
+        priority: str = INTERACTIVE,
+        user_id: int = None
     ):
         """
         Stream job results with multi-pass search strategy and resume-based matching.
@@ -164,158 +200,611 @@ class JobService:
         Pass 1: Exact resume titles + top skills (if resume exists)
         Pass 2: Broader queries if results < results_wanted
         Pass 3: Fallback to major skills/user term
+        
+        Each scraper's jobs are ranked into a top-K heap (K = results_wanted): only jobs
+        that make it are streamed, best first. The search stops once the heap is full,
+        so only the batch that fills it can push out weaker jobs already streamed
+        (stored ones included); those are announced with a result_evict event. Every
+        job that passes the score threshold is saved, streamed or not.
+        
+        `sites` may contain "auto", which expands to the sites that serve `country`
+        (remote-only boards for remote searches) and have delivered best so far.
+        
+        With include_stored (and a session), matching jobs already in the Job table are
+        streamed first, up to LOCAL_RESULTS_SHARE of results_wanted; live results are
+        deduplicated against them and can push them out of the top K.
+        
+        With fan_out (default) every query of a pass is scraped at the same time,
+        bounded by `concurrency` (SEARCH_CONCURRENCY when not given).
+        
+        Outstanding scrapers are cancelled once results_wanted is reached or when
+        `is_disconnected` (e.g. Request.is_disconnected) reports the client has gone.
+        
+        Which (query, site) scrapes each pass runs is chosen by the planner from past
+        yield; with dry_run the plan is streamed and nothing is scraped.
+        
+        With deadline_ms the search stops when the deadline passes: scrapes still
+        running are cancelled, what was already scored has been streamed, and a
+        per-site completeness report is emitted before the final summary.
+        
+        `priority` is the governor priority of this search's scrapes: interactive
+        (a user is watching) or background (bulk work that only uses idle capacity).
+        
+        With a user_id the search counts against that user's quotas: it waits in
+        line behind the user's other searches (status events report its place) or
+        is rejected with an error event, and its scrapes share the user's in-flight
+        scrape limit and fair share of the governor.
+        
+        When the server shuts down (search_drain) the search starts no further pass
+        and stops at the drain deadline like at its own deadline; jobs its scrapes
+        already delivered but it hadn't read yet are still saved to the Job table.
         """
         
-        # Normalize sites to lowercase
-        sites = [s.lower() for s in sites]
+        # "auto" picks sites for the country / remote flag from recorded yield
+        auto = any(site.strip().lower() == "auto" for site in sites)
+        sites = expand_sites(sites, country, is_remote)
         
-        # Initialize scrapers
-        scrapers = []
-        if "google" in sites: scrapers.append(GoogleScraper())
-        if "linkedin" in sites: scrapers.append(LinkedInScraper())
-        if "indeed" in sites: scrapers.append(IndeedScraper())
-        if "glassdoor" in sites: scrapers.append(GlassdoorScraper())
-        if "ziprecruiter" in sites: scrapers.append(ZipRecruiterScraper())
-        if "bayt" in sites: scrapers.append(BaytScraper())
-        if "naukri" in sites: scrapers.append(NaukriScraper())
-        if "adzuna" in sites: scrapers.append(AdzunaScraper())
-        if "remotive" in sites: scrapers.append(RemotiveScraper())
-        if "himalayas" in sites: scrapers.append(HimalayasScraper())
-        if "jobicy" in sites: scrapers.append(JobicyScraper())
-        if "weworkremotely" in sites: scrapers.append(WeWorkRemotelyScraper())
-        if "talent.com" in sites: scrapers.append(TalentScraper())
-        if "jobspresso" in sites: scrapers.append(JobspressoScraper())
-        if "jora" in sites: scrapers.append(JoraScraper())
-        if "remote.co" in sites: scrapers.append(RemoteCoScraper())
-        if "workingnomads" in sites: scrapers.append(WorkingNomadsScraper())
-        if "justremote" in sites: scrapers.append(JustRemoteScraper())
-        if "powertofly" in sites: scrapers.append(PowerToFlyScraper())
-        if "remoteleaf" in sites: scrapers.append(RemoteLeafScraper())
-        if "peopleperhour" in sites: scrapers.append(PeoplePerHourScraper())
-        if "guru" in sites: scrapers.append(GuruScraper())
-        if "truelancer" in sites: scrapers.append(TruelancerScraper())
-        if "builtin" in sites: scrapers.append(BuiltInScraper())
-        if "arc" in sites: scrapers.append(ArcScraper())
-        # NEW working scrapers (Phase 3)
-        if "dice" in sites: scrapers.append(DiceScraper())
-        if "skipthedrive" in sites: scrapers.append(SkipTheDriveScraper())
-        if "themuse" in sites or "muse" in sites: scrapers.append(TheMuseScraper())
+        # Resolve requested sites against the process-wide scraper registry
+        sites = registry.resolve_sites(sites)
         
-        if not scrapers:
+        if not sites:
             yield json.dumps({"type": "error", "message": "No valid sites selected"}) + "\n"
             return
+        
+        if auto:
+            yield json.dumps({"type": "info", "message": f"Auto-selected sites: {', '.join(sites)}"}) + "\n"
+        
+        if dry_run:
+            for event in JobService._plan_events(search_term, resume, results_wanted, sites, country):
+                yield event
+            return
+
+        # Per-user quota: run now, wait for one of the user's other searches to end, or turn away
+        waited_in_line = False
+        if user_id is not None:
+            try:
+                waiter = user_quotas.enter_search(user_id)
+            except QuotaExceeded as e:
+                yield json.dumps({"type": "error", "reason": "quota_exceeded", "message": str(e)}) + "\n"
+                return
+            if waiter is not None:
+                waited_in_line = True
+                try:
+                    position = user_quotas.position(user_id, waiter)
+                    yield JobService._queued_event(position)
+                    give_up = time.monotonic() + USER_SEARCH_QUEUE_SECONDS
+                    while not waiter.done():
+                        try:
+                            await asyncio.wait_for(asyncio.shield(waiter), DISCONNECT_POLL_SECONDS)
+                            break
+                        except asyncio.TimeoutError:
+                            pass
+                        if is_disconnected is not None and await is_disconnected():
+                            user_quotas.cancel_wait(user_id, waiter)
+                            return
+                        if waiter.done():
+                            break
+                        if time.monotonic() >= give_up:
+                            user_quotas.cancel_wait(user_id, waiter, timed_out=True)
+                            yield json.dumps({
+                                "type": "error",
+                                "reason": "quota_timeout",
+                                "message": f"Your other searches are still running after {USER_SEARCH_QUEUE_SECONDS:.0f}s, try again later"
+                            }) + "\n"
+                            return
+                        if user_quotas.position(user_id, waiter) != position:
+                            position = user_quotas.position(user_id, waiter)
+                            yield JobService._queued_event(position)
+                except BaseException:
+                    # Response torn down while waiting in line
+                    user_quotas.cancel_wait(user_id, waiter)
+                    raise
 
         # Multi-pass search strategy
         max_passes = 3
-        all_collected_jobs = []
+        top_jobs = TopK(results_wanted)  # Best results_wanted jobs so far, what gets streamed
+        collected = 0
+        seen_jobs = set()  # Identities of every job this search has received
+        duplicates_dropped = 0
         match_score_threshold = 20.0  # Minimum score to include job
+        search_tasks = []  # Every scraper task of this search, cancelled when we stop early
+        target_reached = False
+        deadline = time.monotonic() + deadline_ms / 1000 if deadline_ms else None
+        deadline_hit = False
+        task_sites = {}  # Scraper task -> site, for the completeness report
+        skipped_empty = 0  # Scrapes not sent because they just came back empty
+        queue = None
+        drained = False  # Cut short by a server shutdown
         
-        for pass_num in range(1, max_passes + 1):
-            # Generate queries for this pass
-            queries = generate_search_queries(resume, search_term, pass_num)
-            
-            if not queries:
-                queries = [search_term]  # Fallback to user term
-            
-            yield json.dumps({
-                "type": "info", 
-                "message": f"Pass {pass_num}: Searching with {len(queries)} queries: {', '.join(queries[:3])}"
-            }) + "\n"
+        search_drain.enter()
+        try:
+            if waited_in_line:
+                yield json.dumps({"type": "status", "state": "running", "message": "Your search is starting"}) + "\n"
             
-            pass_jobs = []
+            if include_stored and session:
+                # Stage 1: answer from jobs scraped by earlier searches, no network involved
+                local_jobs = []
+                stored_seen = set()
+                stored = await asyncio.to_thread(JobService._stored_matches, session, search_term, location, is_remote)
+                for job in stored:
+                    keys = job_identities(job)
+                    if any(key in stored_seen for key in keys):
+                        continue
+                    stored_seen.update(keys)
+                    score = calculate_match_score(job, resume) if resume else 50.0
+                    if score >= match_score_threshold:
+                        job.match_score = int(score)
+                        local_jobs.append(job)
+                
+                local_jobs.sort(key=lambda j: j.match_score, reverse=True)
+                added, _ = top_jobs.offer(local_jobs[:int(results_wanted * LOCAL_RESULTS_SHARE)])
+                collected = len(top_jobs)
+                # Only what was streamed counts as seen, live results may still bring the rest
+                for job in added:
+                    seen_jobs.update(job_identities(job))
+                if added:
+                    yield json.dumps({
+                        "type": "info",
+                        "message": f"Found {len(added)} matching jobs from earlier searches, now searching live..."
+                    }) + "\n"
+                    data = [j.model_dump() for j in added]
+                    yield json.dumps({"type": "result_batch", "source": "stored", "data": data}, default=str) + "\n"
             
-            # Try each query in this pass
-            for query in queries:
-                input_data = ScraperInput(
-                    search_term=query,
-                    location=location,
-                    results_wanted=results_wanted // len(queries) if len(queries) > 1 else results_wanted,
-                    country=country,
-                    is_remote=is_remote,
-                    min_experience=min_experience,
-                    max_experience=max_experience,
-                    hours_old=hours_old,
-                    job_type=[JobType(jt) for jt in job_type] if job_type else None,
-                    offset=offset
-                )
-
-                queue = asyncio.Queue()
-                tasks = []
-
-                # Start scrapers for this query
-                for scraper in scrapers:
-                    tasks.append(asyncio.create_task(
-                        JobService._run_scraper(scraper, input_data, queue)
-                    ))
-
-                # Consume results
-                completed_scrapers = 0
-                while completed_scrapers < len(scrapers):
-                    item = await queue.get()
-                    
-                    if isinstance(item, list):
-                        # Score and filter jobs
-                        for job in item:
-                            score = calculate_match_score(job, resume) if resume else 50.0
-                            if score >= match_score_threshold:
-                                job.match_score = int(score)
-                                pass_jobs.append(job)
-                        completed_scrapers += 1
+            for pass_num in range(1, max_passes + 1):
+                if search_drain.draining:
+                    # Server is shutting down, start nothing new
+                    drained = True
+                    pass_num -= 1  # This one never ran
+                    break
+                
+                # Generate queries for this pass
+                queries = generate_search_queries(resume, search_term, pass_num)
+                
+                if not queries:
+                    queries = [search_term]  # Fallback to user term
+                
+                yield json.dumps({
+                    "type": "info", 
+                    "message": f"Pass {pass_num}: Searching with {len(queries)} queries: {', '.join(queries[:3])}"
+                }) + "\n"
+                
+                pass_found = 0
+                pass_skipped = 0
+                pass_duplicates = 0
+                
+                # Let the planner drop scrapes that historically return little
+                remaining = results_wanted - collected
+                wanted = results_wanted // len(queries) if len(queries) > 1 else results_wanted
+                classes = [(query, query_class(query, search_term, pass_num)) for query in queries]
+                planned, unplanned = planner.plan_pass(classes, sites, country, remaining, wanted)
+                if unplanned:
+                    yield json.dumps({
+                        "type": "info",
+                        "message": f"Planner skipped {len(unplanned)} low-yield site queries"
+                    }) + "\n"
+                
+                input_batches = {}
+                for query in queries:
+                    input_batches[query] = ScraperInput(
+                        search_term=query,
+                        location=location,
+                        results_wanted=wanted,
+                        country=country,
+                        is_remote=is_remote,
+                        min_experience=min_experience,
+                        max_experience=max_experience,
+                        hours_old=hours_old,
+                        job_type=[JobType(jt) for jt in job_type] if job_type else None,
+                        offset=offset
+                    )
+                
+                scheduled = []
+                for p in planned:
+                    if negative_cache.is_empty(scrape_key(p.site, input_batches[p.query])):
+                        pass_skipped += 1
+                        continue
+                    scheduled.append(p)
+                
+                # What's still wanted (plus headroom) is split across the scheduled scrapes
+                # by site page size and expected yield, see PassBudget
+                budget = PassBudget(math.ceil(remaining * PLANNER_HEADROOM), scheduled, country)
+
+                # Fan-out schedules the whole (query x site) matrix of the pass at once,
+                # otherwise queries run one after another as before.
+                if fan_out:
+                    groups = [scheduled]
+                else:
+                    groups = [[p for p in scheduled if p.query == query] for query in queries]
+
+                # One merged stream of results for every scraper in the group
+                # Bounded, so a client that stops reading pauses the scrapers (backpressure)
+                queue = ResultQueue()
+                semaphore = asyncio.Semaphore(max(1, concurrency or SEARCH_CONCURRENCY))
+
+                for group in groups:
+                    tasks = []
+                    for p in group:
+                        task = asyncio.create_task(
+                            JobService._run_scraper(p.site, input_batches[p.query], queue, semaphore, p.qclass, budget, priority, user_id)
+                        )
+                        task_sites[task] = p.site
+                        tasks.append(task)
+                    search_tasks.extend(tasks)
+
+                    # Consume results
+                    completed_scrapers = 0
+                    while completed_scrapers < len(tasks):
+                        item = await JobService._next_item(queue, is_disconnected, deadline)
                         
-                    elif isinstance(item, str):
-                        # Stream log message
-                        yield json.dumps({"type": "update", "message": item}) + "\n"
-                    
-                    queue.task_done()
+                        if item is None:
+                            # Client went away, the finally block cancels the scrapers
+                            logger.info("Client disconnected, abandoning search")
+                            return
+                        
+                        if item is DEADLINE_REACHED:
+                            deadline_hit = True
+                            drained = search_drain.draining
+                            break
+                        
+                        if isinstance(item, list):
+                            # Dedupe, score and filter this scraper's jobs as soon as it finishes
+                            batch_jobs = []
+                            for job in item:
+                                # Drop postings already seen from another query or pass before
+                                # scoring, so they aren't scored, streamed or saved twice
+                                keys = job_identities(job)
+                                if any(key in seen_jobs for key in keys):
+                                    pass_duplicates += 1
+                                    continue
+                                seen_jobs.update(keys)
+                                score = calculate_match_score(job, resume) if resume else 50.0
+                                if score >= match_score_threshold:
+                                    job.match_score = int(score)
+                                    batch_jobs.append(job)
+                            completed_scrapers += 1
+                            
+                            # Every match is kept for later searches, streamed or not
+                            if session and batch_jobs:
+                                JobService._save_jobs_to_db(batch_jobs, session)
+                            
+                            # Only jobs that make the top results_wanted go out, best first
+                            added, evicted = top_jobs.offer(batch_jobs)
+                            collected = len(top_jobs)
+                            
+                            if evicted:
+                                # Already streamed jobs pushed out by better matches
+                                yield json.dumps({"type": "result_evict", "job_urls": [j.job_url for j in evicted]}) + "\n"
+                            
+                            if added:
+                                pass_found += len(added)
+                                
+                                # Stream this scraper's results right away
+                                data = [j.model_dump() if hasattr(j, "model_dump") else j.dict() for j in added]
+                                yield json.dumps({"type": "result_batch", "data": data}, default=str) + "\n"
+                            
+                        elif isinstance(item, str):
+                            # Stream log message
+                            yield json.dumps({"type": "update", "message": item}) + "\n"
+                        
+                        if collected >= results_wanted:
+                            target_reached = True
+                            break
 
-                await asyncio.gather(*tasks)
-            
-            # Add jobs from this pass
-            all_collected_jobs.extend(pass_jobs)
+                    if target_reached or deadline_hit:
+                        # Don't let the remaining scrapers keep paginating for nothing
+                        JobService._cancel_tasks(tasks)
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                    
+                    if target_reached or deadline_hit:
+                        break
+                
+                if pass_skipped:
+                    skipped_empty += pass_skipped
+                    yield json.dumps({
+                        "type": "info",
+                        "message": f"Skipped {pass_skipped} site queries that recently returned no jobs"
+                    }) + "\n"
+                
+                duplicates_dropped += pass_duplicates
+                yield json.dumps({
+                    "type": "success",
+                    "message": f"Pass {pass_num} complete: {pass_found} jobs, {pass_duplicates} duplicates dropped (Total: {collected})"
+                }) + "\n"
+                
+                # Stop if we have enough results
+                if target_reached:
+                    yield json.dumps({
+                        "type": "info",
+                        "message": f"Target reached ({collected} >= {results_wanted}). Stopping search."
+                    }) + "\n"
+                    break
+                
+                if deadline_hit:
+                    break
             
-            # Save to database
-            if session and pass_jobs:
-                JobService._save_jobs_to_db(pass_jobs, session)
+            if drained:
+                search_drain.cut_off += 1
+                yield json.dumps({
+                    "type": "info",
+                    "message": f"Server is restarting, stopping with {collected} jobs. Search again in a moment for more."
+                }) + "\n"
+            elif deadline_hit:
+                yield json.dumps({
+                    "type": "info",
+                    "message": f"Deadline of {deadline_ms}ms reached with {collected} jobs. Stopping search."
+                }) + "\n"
             
-            # Stream results from this pass
-            data = [j.model_dump() if hasattr(j, "model_dump") else j.dict() for j in pass_jobs]
-            yield json.dumps({"type": "result_batch", "data": data}, default=str) + "\n"
+            if deadline is not None:
+                yield json.dumps({
+                    "type": "report",
+                    "deadline_ms": deadline_ms,
+                    "deadline_reached": deadline_hit,
+                    "sites": JobService._site_report(task_sites)
+                }) + "\n"
             
+            # Final summary
             yield json.dumps({
-                "type": "success",
-                "message": f"Pass {pass_num} complete: {len(pass_jobs)} jobs (Total: {len(all_collected_jobs)})"
+                "type": "complete",
+                "message": f"Search complete! Found {collected} matching jobs across {pass_num} pass(es).",
+                "requests_avoided": skipped_empty,
+                "duplicates_dropped": duplicates_dropped,
+                "partial": deadline_hit or drained
             }) + "\n"
-            
-            # Stop if we have enough results
-            if len(all_collected_jobs) >= results_wanted:
-                yield json.dumps({
-                    "type": "info",
-                    "message": f"Target reached ({len(all_collected_jobs)} >= {results_wanted}). Stopping search."
-                }) + "\n"
+        finally:
+            # Runs on normal completion, early return and when the response is torn down
+            JobService._cancel_tasks(search_tasks)
+            if search_drain.draining and queue is not None and session:
+                # Scraped but never read: keep it for the next search instead of scraping it again
+                unread = JobService._unread_jobs(queue, seen_jobs, resume, match_score_threshold)
+                if unread:
+                    JobService._save_jobs_to_db(unread, session)
+                    search_drain.flushed_jobs += len(unread)
+                    logger.info(f"Saved {len(unread)} unread jobs of a search cut short by shutdown")
+            search_drain.leave()
+            if user_id is not None:
+                user_quotas.leave_search(user_id)
+
+    @staticmethod
+    def _unread_jobs(queue: ResultQueue, seen_jobs: Set[tuple], resume: dict = None, threshold: float = 0) -> List[JobPost]:
+        """New jobs left in a search's queue when it stops reading that score at least `threshold`."""
+        unread = []
+        for item in queue.drain():
+            if not isinstance(item, list):
+                continue
+            for job in item:
+                keys = job_identities(job)
+                if any(key in seen_jobs for key in keys):
+                    continue
+                seen_jobs.update(keys)
+                score = calculate_match_score(job, resume) if resume else 50.0
+                if score >= threshold:
+                    job.match_score = int(score)
+                    unread.append(job)
+        return unread
+
+    @staticmethod
+    def _queued_event(position: int) -> str:
+        return json.dumps({
+            "type": "status",
+            "state": "queued",
+            "position": position,
+            "message": f"Waiting for your other searches to finish (#{position} in line)"
+        }) + "\n"
+
+    @staticmethod
+    def _plan_events(search_term: str, resume: dict, results_wanted: int, sites: List[str], country: str) -> List[str]:
+        """
+        Dry run: the scrapes each pass would run, assuming every pass brings in what
+        the planner expects of it (less the headroom kept for dedup and filtering).
+        """
+        events = []
+        remaining = results_wanted
+        total = 0
+        for pass_num in range(1, 4):
+            queries = generate_search_queries(resume, search_term, pass_num) or [search_term]
+            wanted = results_wanted // len(queries) if len(queries) > 1 else results_wanted
+            classes = [(query, query_class(query, search_term, pass_num)) for query in queries]
+            planned, unplanned = planner.plan_pass(classes, sites, country, remaining, wanted)
+            total += len(planned)
+            expected = sum(p.expected for p in planned)
+            events.append(json.dumps({
+                "type": "plan",
+                "pass": pass_num,
+                "expected_jobs": round(expected, 1),
+                "scrapes": [p.to_dict() for p in planned],
+                "skipped": [p.to_dict() for p in unplanned],
+            }) + "\n")
+            remaining -= int(expected / PLANNER_HEADROOM)
+            if remaining <= 0:
                 break
-        
-        # Final summary
-        yield json.dumps({
+        events.append(json.dumps({
             "type": "complete",
-            "message": f"Search complete! Found {len(all_collected_jobs)} matching jobs across {pass_num} pass(es)."
-        }) + "\n"
+            "message": f"Dry run: {total} scrapes planned across {pass_num} pass(es), nothing was scraped."
+        }) + "\n")
+        return events
+
+    @staticmethod
+    def _site_report(task_sites: Dict[asyncio.Task, str]) -> Dict[str, Dict[str, int]]:
+        """
+        Per site: scrapes scheduled, finished, cut off by the deadline, and jobs returned.
+        """
+        report = {}
+        for task, site in task_sites.items():
+            entry = report.setdefault(site, {"scheduled": 0, "completed": 0, "timed_out": 0, "jobs_returned": 0})
+            entry["scheduled"] += 1
+            if task.cancelled():
+                entry["timed_out"] += 1
+            elif task.done():
+                entry["completed"] += 1
+                entry["jobs_returned"] += task.result() or 0
+        return report
+
+    @staticmethod
+    async def _next_item(queue, is_disconnected=None, deadline=None):
+        """
+        Wait for the next queue item. Returns None if the client disconnected meanwhile,
+        and DEADLINE_REACHED once `deadline` (time.monotonic()) has passed and nothing
+        already queued is left.
+        """
+        while True:
+            # Polls even without a disconnect check, so a shutdown drain is noticed
+            timeout = DISCONNECT_POLL_SECONDS
+            # Re-read every round, a shutdown can bring the deadline forward
+            effective = search_drain.deadline_for(deadline)
+            if effective is not None:
+                left = effective - time.monotonic()
+                if left <= 0:
+                    return queue.get_nowait() if not queue.empty() else DEADLINE_REACHED
+                timeout = min(timeout, left)
+            try:
+                return await asyncio.wait_for(queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                if is_disconnected is not None and await is_disconnected():
+                    return None
 
+    @staticmethod
+    def _cancel_tasks(tasks):
+        for task in tasks:
+            if not task.done():
+                task.cancel()
 
     @staticmethod
-    async def _run_scraper(scraper, input_data, queue):
+    async def _run_scraper(site, input_data, queue, semaphore, qclass="other", budget=None, priority=INTERACTIVE, user_id=None):
+        key = scrape_key(site, input_data)
+        query = input_data.search_term
+        got = 0
         try:
-            site_name = scraper.site_name
-            await queue.put(f"Starting scrape on {site_name}...")
-            
-            # Blocking call in thread
-            jobs = await asyncio.to_thread(scraper.scrape, input_data)
+            async with semaphore:
+                if budget is not None:
+                    # Sized when the scrape starts, so it includes what finished scrapes left over
+                    input_data = input_data.model_copy(update={"results_wanted": budget.take(site, query)})
+                
+                cached = result_cache.get(key, input_data.results_wanted)
+                if cached is not None:
+                    await queue.put(f"Using cached results from {site} for '{input_data.search_term}'")
+                    got = len(cached)
+                    await queue.put(cached)
+                    return got
+                
+                if user_quotas.scrapes_full(user_id):
+                    await queue.put(f"Waiting for your other scrapes to finish before {site} ({USER_MAX_SCRAPES} at a time)...")
+                
+                # The user's in-flight scrape quota, across all of their searches
+                async with user_quotas.scrape_slot(user_id):
+                    # Flights are per priority: an interactive search must not wait behind
+                    # a background one's governor slot, outside the interactive reserve
+                    flight_key = (priority,) + key
+                    if singleflight.in_flight(flight_key, input_data.results_wanted):
+                        await queue.put(f"Joining in-flight scrape on {site} for '{input_data.search_term}'...")
+                    else:
+                        await queue.put(f"Starting scrape on {site} for '{input_data.search_term}'...")
+                    
+                    # Identical concurrent scrapes (same normalized input) share one run
+                    jobs = await singleflight.do(
+                        flight_key, input_data.results_wanted,
+                        lambda: JobService._fetch(site, input_data, key, qclass, priority, user_id)
+                    )
             
-            await queue.put(f"Found {len(jobs)} jobs on {site_name}")
+            got = len(jobs)
+            await queue.put(f"Found {len(jobs)} jobs on {site} for '{input_data.search_term}'")
             await queue.put(jobs) # Put raw JobPost objects
             
+        except GovernorBusy:
+            await queue.put(f"Server is busy, skipped {site} for '{input_data.search_term}'")
+            await queue.put([])
         except Exception as e:
-            await queue.put(f"Error on {scraper.site_name}: {e}")
+            await queue.put(f"Error on {site}: {e}")
             await queue.put([]) # Signal done with empty list
+        finally:
+            if budget is not None:
+                budget.finish(site, query, got)
+        return got
+
+    @staticmethod
+    async def _fetch(site: str, input_data: ScraperInput, key: tuple, qclass: str, priority: str = INTERACTIVE, user_id: int = None) -> List[JobPost]:
+        # Runs once per flight, so only the leading search writes the cache and stats
+        start = time.monotonic()
+        try:
+            jobs = await JobService._governed_scrape(site, input_data, priority, user_id)
+        except GovernorBusy:
+            raise
+        except Exception:
+            planner.record(site, qclass, input_data.country, 0, input_data.results_wanted, time.monotonic() - start, failed=True)
+            raise
+        planner.record(site, qclass, input_data.country, len(jobs), input_data.results_wanted, time.monotonic() - start)
+        if jobs:
+            result_cache.put(key, input_data.results_wanted, jobs)
+        else:
+            negative_cache.mark_empty(key)
+        return jobs
+
+    @staticmethod
+    async def _governed_scrape(site: str, input_data: ScraperInput, priority: str = INTERACTIVE, user_id: int = None) -> List[JobPost]:
+        if SCRAPER_ISOLATION == "queue":
+            # Runs on a worker node, which applies the limits cluster-wide
+            return await scrape_queue.run(site, input_data, priority)
+        # Process-wide global and per-site limits, interactive scrapes first, fair between users
+        async with governor.slot(site, priority, user_id, user_quotas.weight(user_id)):
+            return await JobService._scrape(site, input_data)
+
+    @staticmethod
+    async def _scrape(site: str, input_data: ScraperInput) -> List[JobPost]:
+        if SCRAPER_ISOLATION == "process":
+            # Isolated worker process, the API never imports the scraper
+            return await process_pool.run(site, input_data)
+        return await JobService._scrape_local(site, input_data)
+
+    @staticmethod
+    async def _scrape_local(site: str, input_data: ScraperInput) -> List[JobPost]:
+        # Module import happens on first use only, keep it off the event loop
+        scraper_cls = await governor.run_in_thread(registry.scraper_class, site)
+        if scraper_cls.is_native_async():
+            # Runs on the event loop over the shared HTTP client, no thread held
+            return await registry.shared(site).ascrape(input_data)
+        # Blocking scrapers are adapted onto the governor's scraper threads
+        return await governor.run_in_thread(JobService._scrape_site, site, input_data)
+
+    @staticmethod
+    def _scrape_site(site: str, input_data: ScraperInput) -> List[JobPost]:
+        # Runs in a worker thread with a warm, exclusively leased scraper
+        with registry.lease(site) as scraper:
+            return scraper.scrape(input_data)
+
+    @staticmethod
+    def _stored_matches(session: Session, search_term: str, location: str, is_remote: bool, limit: int = 200) -> List[JobPost]:
+        """Recently scraped jobs from the Job table matching the search term (and location)."""
+        cutoff = datetime.utcnow() - timedelta(days=LOCAL_RESULTS_MAX_AGE_DAYS)
+        query = select(Job).where(Job.created_at >= cutoff)
+        
+        # Every word of the term in the title, e.g. "python developer" matches "Senior Python Backend Developer"
+        for word in (search_term or "").split():
+            query = query.where(col(Job.title).ilike(f"%{word}%"))
+        if location and location.strip() and not is_remote:
+            query = query.where(col(Job.location).ilike(f"%{location.strip()}%"))
+        
+        try:
+            rows = session.exec(query.order_by(col(Job.created_at).desc()).limit(limit)).all()
+        except Exception as e:
+            logger.error(f"DB Error reading stored jobs: {e}")
+            session.rollback()
+            return []
+        
+        jobs = []
+        for row in rows:
+            try:
+                posted = date.fromisoformat(row.date_posted) if row.date_posted else None
+            except ValueError:
+                posted = None
+            jobs.append(JobPost(
+                title=row.title,
+                company=row.company,
+                job_url=row.job_url,
+                location=row.location,
+                description=row.description,
+                date_posted=posted,
+                site=row.site
+            ))
+        return jobs
 
     @staticmethod
     def _save_jobs_to_db(jobs: List[JobPost], session: Session):
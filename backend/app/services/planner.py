@@ -0,0 +1,188 @@
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# Weight of the newest scrape in the moving averages
+PLANNER_ALPHA = float(os.getenv("PLANNER_ALPHA", 0.3))
+# Scrapes of a (site, query class, country) before its numbers are trusted
+PLANNER_MIN_SAMPLES = int(os.getenv("PLANNER_MIN_SAMPLES", 3))
+# Expected jobs planned per job still wanted, covers dedup and the match score filter
+PLANNER_HEADROOM = float(os.getenv("PLANNER_HEADROOM", 1.5))
+# Known pairs failing more often than this are left out of plans
+PLANNER_MAX_FAILURE_RATE = float(os.getenv("PLANNER_MAX_FAILURE_RATE", 0.8))
+
+# Assumed share of results_wanted a scrape without enough history returns
+UNKNOWN_FILL = 0.5
+
+
+def query_class(query: str, search_term: str, pass_num: int) -> str:
+    """
+    Coarse kind of query, mirrors the passes of generate_search_queries.
+    """
+    if search_term and query.strip().lower() == search_term.strip().lower():
+        return "user"
+    return {1: "title", 2: "broad", 3: "skill"}.get(pass_num, "other")
+
+
+class SiteStats:
+    """
+    Moving averages for one (site, query class, country).
+    """
+
+    def __init__(self):
+        self.samples = 0
+        self.yield_ = 0.0  # Jobs returned per scrape
+        self.fill = 0.0  # Share of the results asked for that came back
+        self.latency = 0.0  # Seconds per scrape
+        self.failure_rate = 0.0
+
+    def update(self, jobs: int, asked: int, latency: float, failed: bool):
+        fill = min(jobs / asked, 1.0) if asked else 0.0
+        if self.samples == 0:
+            self.yield_, self.fill, self.latency, self.failure_rate = float(jobs), fill, latency, float(failed)
+        else:
+            a = PLANNER_ALPHA
+            self.yield_ += a * (jobs - self.yield_)
+            self.fill += a * (fill - self.fill)
+            self.latency += a * (latency - self.latency)
+            self.failure_rate += a * (float(failed) - self.failure_rate)
+        self.samples += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "samples": self.samples,
+            "yield": round(self.yield_, 2),
+            "fill": round(self.fill, 3),
+            "latency_ms": round(self.latency * 1000, 1),
+            "failure_rate": round(self.failure_rate, 3),
+        }
+
+
+class PlannedScrape:
+    def __init__(self, site: str, query: str, qclass: str, expected: float, stats: Optional[SiteStats]):
+        self.site = site
+        self.query = query
+        self.qclass = qclass
+        self.expected = expected
+        self.stats = stats
+
+    def to_dict(self) -> dict:
+        data = {"site": self.site, "query": self.query, "query_class": self.qclass, "expected_jobs": round(self.expected, 1)}
+        if self.stats is not None:
+            data.update(self.stats.to_dict())
+        return data
+
+
+class SearchPlanner:
+    """
+    Chooses which (query, site) scrapes a pass runs, from what similar scrapes
+    returned before.
+
+    Pairs with too little history always run so their numbers get learned.
+    Known pairs are added best expected yield first (latency breaks ties) until
+    the pass is expected to cover what's still wanted, with headroom for dedup
+    and score filtering. Pairs that mostly fail are dropped.
+
+    History is learned from this process's scrapes and kept in memory, so a
+    restart starts every pair from scratch.
+    """
+
+    def __init__(self):
+        self._stats: Dict[Tuple[str, str, str], SiteStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, site: str, qclass: str, country: str, jobs: int, asked: int, latency: float, failed: bool = False):
+        key = (site, qclass, (country or "").lower())
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = SiteStats()
+            stats.update(jobs, asked, latency, failed)
+
+    def lookup(self, site: str, qclass: str, country: str) -> Optional[SiteStats]:
+        return self._stats.get((site, qclass, (country or "").lower()))
+
+    def fill_ratio(self, site: str, qclass: str, country: str) -> float:
+        """
+        Expected share of a scrape's results_wanted that comes back, failures included.
+        """
+        stats = self.lookup(site, qclass, country)
+        if stats is None or stats.samples < PLANNER_MIN_SAMPLES:
+            return UNKNOWN_FILL
+        return stats.fill * (1 - stats.failure_rate)
+
+    def site_summary(self, site: str, country: str) -> Optional[SiteStats]:
+        """
+        One site's numbers in a country across every query class, averaged by
+        samples, so resume-driven searches (title/broad/skill queries) count too.
+        """
+        country = (country or "").lower()
+        with self._lock:
+            parts = [stats for (s, _, c), stats in self._stats.items() if s == site and c == country]
+        samples = sum(stats.samples for stats in parts)
+        if not samples:
+            return None
+        summary = SiteStats()
+        summary.samples = samples
+        summary.yield_ = sum(stats.yield_ * stats.samples for stats in parts) / samples
+        summary.fill = sum(stats.fill * stats.samples for stats in parts) / samples
+        summary.latency = sum(stats.latency * stats.samples for stats in parts) / samples
+        summary.failure_rate = sum(stats.failure_rate * stats.samples for stats in parts) / samples
+        return summary
+
+    def expected_yield(self, site: str, qclass: str, country: str, wanted: int) -> float:
+        return wanted * self.fill_ratio(site, qclass, country)
+
+    def plan_pass(
+        self,
+        queries: List[Tuple[str, str]],
+        sites: List[str],
+        country: str,
+        remaining: int,
+        wanted: int,
+    ) -> Tuple[List[PlannedScrape], List[PlannedScrape]]:
+        """
+        Split the (query x site) matrix of a pass into scrapes to run and scrapes
+        to skip. `queries` are (query, query class) pairs, `wanted` is the
+        results_wanted each scrape asks for.
+        """
+        exploring, known = [], []
+        for query, qclass in queries:
+            for site in sites:
+                stats = self.lookup(site, qclass, country)
+                planned = PlannedScrape(site, query, qclass, self.expected_yield(site, qclass, country, wanted), stats)
+                if stats is None or stats.samples < PLANNER_MIN_SAMPLES:
+                    exploring.append(planned)
+                else:
+                    known.append(planned)
+
+        selected = list(exploring)
+        skipped = []
+        covered = sum(p.expected for p in exploring)
+        needed = remaining * PLANNER_HEADROOM
+        known.sort(key=lambda p: (-p.expected, p.stats.latency))
+        for planned in known:
+            if planned.stats.failure_rate > PLANNER_MAX_FAILURE_RATE or planned.expected <= 0 or covered >= needed:
+                skipped.append(planned)
+                continue
+            selected.append(planned)
+            covered += planned.expected
+
+        # Always run something, the best of what was skipped
+        if not selected and skipped:
+            selected.append(skipped.pop(0))
+
+        # Keep the original (query, site) order for the run itself
+        order = {(query, site): i for i, (query, site) in enumerate((q, s) for q, _ in queries for s in sites)}
+        selected.sort(key=lambda p: order[(p.query, p.site)])
+        return selected, skipped
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                f"{site}/{qclass}/{country}": stats.to_dict()
+                for (site, qclass, country), stats in sorted(self._stats.items())
+            }
+
+
+planner = SearchPlanner()
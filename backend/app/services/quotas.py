@@ -0,0 +1,189 @@
+import asyncio
+import logging
+import os
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+logger = logging.getLogger("UserQuotas")
+
+# Searches one user may run at once, further ones wait in line
+USER_MAX_SEARCHES = int(os.getenv("USER_MAX_SEARCHES", 2))
+# Searches one user may have waiting before new ones are turned away
+USER_MAX_QUEUED_SEARCHES = int(os.getenv("USER_MAX_QUEUED_SEARCHES", 2))
+# How long a search waits for its turn before giving up
+USER_SEARCH_QUEUE_SECONDS = float(os.getenv("USER_SEARCH_QUEUE_SECONDS", 60))
+# Scrapes one user's searches may have in flight at once, across all of them
+USER_MAX_SCRAPES = int(os.getenv("USER_MAX_SCRAPES", 8))
+
+
+def _parse_weights(value: str) -> Dict[int, float]:
+    # Fair-queuing weights by user id, e.g. USER_WEIGHTS="1:4,17:2" (default 1)
+    weights = {}
+    for item in value.split(","):
+        if ":" not in item:
+            continue
+        user_id, weight = item.split(":", 1)
+        try:
+            weights[int(user_id)] = max(0.1, float(weight))
+        except ValueError:
+            logger.warning(f"Ignoring bad USER_WEIGHTS entry: {item}")
+    return weights
+
+
+class QuotaExceeded(Exception):
+    pass
+
+
+class _UserState:
+    def __init__(self):
+        self.searches = 0
+        self.waiters = deque()  # Futures of searches waiting for a slot, in arrival order
+        self.scrapes = asyncio.Semaphore(USER_MAX_SCRAPES)
+        self.scrapes_running = 0
+
+    @property
+    def idle(self) -> bool:
+        return not self.searches and not self.waiters and not self.scrapes_running
+
+
+class UserQuotas:
+    """
+    Per-user admission control, so one user's tabs can't starve everyone else.
+
+    A user runs at most USER_MAX_SEARCHES searches at once; later ones wait in
+    line (first come, first served) and beyond USER_MAX_QUEUED_SEARCHES waiting
+    they are rejected with QuotaExceeded. Across all of a user's searches at
+    most USER_MAX_SCRAPES scrapes are in flight. The governor then shares slots
+    between users by weighted fair queuing (weight()).
+
+    Counts are per process: with several API processes each enforces the
+    limits on the searches it serves.
+    """
+
+    def __init__(
+        self,
+        max_searches: int = USER_MAX_SEARCHES,
+        max_queued: int = USER_MAX_QUEUED_SEARCHES,
+        weights: Dict[int, float] = None,
+    ):
+        self.max_searches = max(1, max_searches)
+        self.max_queued = max_queued
+        self.weights = weights if weights is not None else _parse_weights(os.getenv("USER_WEIGHTS", ""))
+        self._users: Dict[int, _UserState] = {}
+
+        # Metrics
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def _state(self, user_id: int) -> _UserState:
+        state = self._users.get(user_id)
+        if state is None:
+            state = _UserState()
+            self._users[user_id] = state
+        return state
+
+    def _forget_if_idle(self, user_id: int):
+        state = self._users.get(user_id)
+        if state is not None and state.idle:
+            del self._users[user_id]
+
+    def weight(self, user_id: Optional[int]) -> float:
+        return self.weights.get(user_id, 1.0)
+
+    def enter_search(self, user_id: int) -> Optional[asyncio.Future]:
+        """
+        Start a search. Returns None when it may run now, otherwise a future that
+        resolves once it may (pass it to position() / cancel_wait()). Raises
+        QuotaExceeded when the user already has too many searches waiting.
+        """
+        state = self._state(user_id)
+        if state.searches < self.max_searches and not state.waiters:
+            state.searches += 1
+            self.admitted += 1
+            return None
+        if len(state.waiters) >= self.max_queued:
+            self.rejected += 1
+            raise QuotaExceeded(
+                f"You already have {state.searches} searches running and {len(state.waiters)} waiting, "
+                f"wait for one to finish or close a tab"
+            )
+        waiter = asyncio.get_running_loop().create_future()
+        state.waiters.append(waiter)
+        self.queued += 1
+        return waiter
+
+    def position(self, user_id: int, waiter: asyncio.Future) -> int:
+        """1-based place of a waiting search in its user's line."""
+        state = self._users.get(user_id)
+        try:
+            return state.waiters.index(waiter) + 1
+        except (AttributeError, ValueError):
+            return 0
+
+    def cancel_wait(self, user_id: int, waiter: asyncio.Future, timed_out: bool = False):
+        """A waiting search gave up (or its client left). Releases the slot if it had just been granted."""
+        if waiter.done() and not waiter.cancelled():
+            self.leave_search(user_id)
+            return
+        waiter.cancel()
+        state = self._users.get(user_id)
+        if state is not None and waiter in state.waiters:
+            state.waiters.remove(waiter)
+        if timed_out:
+            self.timed_out += 1
+        self._forget_if_idle(user_id)
+
+    def leave_search(self, user_id: int):
+        state = self._users.get(user_id)
+        if state is None:
+            return
+        # Hand the slot straight to the next waiting search
+        while state.waiters:
+            waiter = state.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)
+                self.admitted += 1
+                return
+        state.searches -= 1
+        self._forget_if_idle(user_id)
+
+    def scrapes_full(self, user_id: Optional[int]) -> bool:
+        state = self._users.get(user_id)
+        return state is not None and state.scrapes.locked()
+
+    @asynccontextmanager
+    async def scrape_slot(self, user_id: Optional[int]):
+        """Hold one of the user's USER_MAX_SCRAPES in-flight scrapes (no limit without a user)."""
+        if user_id is None:
+            yield
+            return
+        state = self._state(user_id)
+        try:
+            async with state.scrapes:
+                state.scrapes_running += 1
+                try:
+                    yield
+                finally:
+                    state.scrapes_running -= 1
+        finally:
+            # Also when the scrape is cancelled, its search may already have left
+            self._forget_if_idle(user_id)
+
+    def stats(self) -> dict:
+        return {
+            "max_searches_per_user": self.max_searches,
+            "max_scrapes_per_user": USER_MAX_SCRAPES,
+            "active_users": len(self._users),
+            "searches_running": sum(state.searches for state in self._users.values()),
+            "searches_waiting": sum(len(state.waiters) for state in self._users.values()),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+
+user_quotas = UserQuotas()
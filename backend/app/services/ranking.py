@@ -0,0 +1,41 @@
+import heapq
+from typing import List, Tuple
+
+from app.models.job import JobPost
+
+
+class TopK:
+    """
+    The K best-scoring jobs a search has seen, as a min-heap on match_score.
+
+    offer() takes a scored batch and returns the jobs that made it into the top K
+    (best first) and the previously returned jobs they pushed out. Memory stays at
+    K jobs however many are scraped. On equal scores the earlier job stays.
+    """
+
+    def __init__(self, k: int):
+        self.k = max(1, k)
+        self._heap: List[Tuple[int, int, JobPost]] = []
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def offer(self, jobs: List[JobPost]) -> Tuple[List[JobPost], List[JobPost]]:
+        added = {}
+        evicted = []
+        for job in jobs:
+            # -seq: among equal scores the newest sits at the top of the min-heap
+            entry = (job.match_score or 0, -self._seq, job)
+            self._seq += 1
+            if len(self._heap) < self.k:
+                heapq.heappush(self._heap, entry)
+            elif entry[0] > self._heap[0][0]:
+                dropped = heapq.heapreplace(self._heap, entry)[2]
+                # A job from this same batch never went out, just forget it
+                if added.pop(id(dropped), None) is None:
+                    evicted.append(dropped)
+            else:
+                continue
+            added[id(job)] = job
+        return sorted(added.values(), key=lambda job: job.match_score or 0, reverse=True), evicted
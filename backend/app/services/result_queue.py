@@ -0,0 +1,124 @@
+import asyncio
+import os
+import time
+import weakref
+from collections import deque
+from typing import Any
+
+# Per search: how much scraped data may wait for the client before scrapers pause
+SEARCH_QUEUE_MAX_BYTES = int(os.getenv("SEARCH_QUEUE_MAX_BYTES", 2 * 1024 * 1024))
+SEARCH_QUEUE_MAX_ITEMS = int(os.getenv("SEARCH_QUEUE_MAX_ITEMS", 200))
+
+# Rough per-job overhead on top of its text fields
+JOB_OVERHEAD_BYTES = 256
+
+
+def item_bytes(item: Any) -> int:
+    """
+    Approximate memory held by a queue item: a log line or a list of JobPost.
+    """
+    if isinstance(item, str):
+        return len(item)
+    if isinstance(item, list):
+        return sum(
+            JOB_OVERHEAD_BYTES + len(job.title or "") + len(job.company or "") + len(job.job_url or "") + len(job.description or "")
+            for job in item
+        )
+    return JOB_OVERHEAD_BYTES
+
+
+class ResultQueue:
+    """
+    Bounded queue between a search's scrapers and its response generator.
+
+    The generator only reads when the client takes the next chunk, so with a slow
+    or stalled client put() blocks once SEARCH_QUEUE_MAX_BYTES (or _ITEMS) are
+    waiting, and the scrapers of that search pause instead of piling results up
+    in memory. An item bigger than the whole budget is still let through when
+    the queue is empty, so one huge page can't wedge the search.
+    """
+
+    # Every live queue, for process-wide depth metrics
+    _live = weakref.WeakSet()
+    # Process-wide counters
+    blocked_puts = 0
+    blocked_seconds = 0.0
+    peak_bytes = 0
+
+    def __init__(self, max_bytes: int = SEARCH_QUEUE_MAX_BYTES, max_items: int = SEARCH_QUEUE_MAX_ITEMS):
+        self.max_bytes = max_bytes
+        self.max_items = max(1, max_items)
+        self.bytes = 0
+        self._items = deque()
+        self._cond = asyncio.Condition()
+        ResultQueue._live.add(self)
+
+    def _has_room(self, size: int) -> bool:
+        if not self._items:
+            return True
+        return len(self._items) < self.max_items and self.bytes + size <= self.max_bytes
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    async def put(self, item: Any):
+        size = item_bytes(item)
+        async with self._cond:
+            if not self._has_room(size):
+                start = time.monotonic()
+                ResultQueue.blocked_puts += 1
+                try:
+                    await self._cond.wait_for(lambda: self._has_room(size))
+                finally:
+                    ResultQueue.blocked_seconds += time.monotonic() - start
+            self._items.append((item, size))
+            self.bytes += size
+            ResultQueue.peak_bytes = max(ResultQueue.peak_bytes, self.bytes)
+            self._cond.notify_all()
+
+    async def get(self) -> Any:
+        async with self._cond:
+            await self._cond.wait_for(lambda: bool(self._items))
+            item = self._pop()
+            self._cond.notify_all()
+            return item
+
+    def get_nowait(self) -> Any:
+        if not self._items:
+            raise asyncio.QueueEmpty
+        item = self._pop()
+        # Wake blocked producers without awaiting the lock
+        asyncio.get_running_loop().create_task(self._wake())
+        return item
+
+    def drain(self) -> list:
+        """Take everything still queued at once, for a search that stops reading. Producers aren't woken."""
+        items = [item for item, _ in self._items]
+        self._items.clear()
+        self.bytes = 0
+        return items
+
+    def _pop(self) -> Any:
+        item, size = self._items.popleft()
+        self.bytes -= size
+        return item
+
+    async def _wake(self):
+        async with self._cond:
+            self._cond.notify_all()
+
+    @classmethod
+    def stats(cls) -> dict:
+        queues = list(cls._live)
+        return {
+            "searches": len(queues),
+            "depth_items": sum(q.qsize() for q in queues),
+            "depth_bytes": sum(q.bytes for q in queues),
+            "max_bytes_per_search": SEARCH_QUEUE_MAX_BYTES,
+            "peak_bytes": cls.peak_bytes,
+            "blocked_puts": cls.blocked_puts,
+            "blocked_seconds": round(cls.blocked_seconds, 2),
+        }
@@ -0,0 +1,251 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, delete, update
+from sqlmodel import Session, select, col
+
+from app.db.session import engine
+from app.db.models import ScrapeTask, ScrapeTaskStatus
+from app.models.job import ScraperInput, JobPost, ScraperError
+from app.services.governor import governor, INTERACTIVE, PRIORITIES
+
+logger = logging.getLogger("ScrapeQueue")
+
+# How often the API looks for finished scrapes, and idle workers for new ones
+SCRAPE_QUEUE_POLL_SECONDS = float(os.getenv("SCRAPE_QUEUE_POLL_SECONDS", 0.5))
+# A queued scrape not finished this long after it was queued is given up on
+SCRAPE_QUEUE_TIMEOUT = float(os.getenv("SCRAPE_QUEUE_TIMEOUT", 300))
+# A running scrape whose worker hasn't checked in for this long goes back on the queue
+SCRAPE_QUEUE_LEASE_SECONDS = float(os.getenv("SCRAPE_QUEUE_LEASE_SECONDS", 60))
+# Tries per scrape (dead workers included) before it is failed
+SCRAPE_QUEUE_MAX_ATTEMPTS = int(os.getenv("SCRAPE_QUEUE_MAX_ATTEMPTS", 2))
+# Finished rows nobody collected (their API node went away) are deleted after this
+SCRAPE_QUEUE_RETENTION_SECONDS = int(os.getenv("SCRAPE_QUEUE_RETENTION_SECONDS", 3600))
+
+FINISHED = (ScrapeTaskStatus.DONE, ScrapeTaskStatus.FAILED)
+
+
+class ScrapeQueue:
+    """
+    Scrape work queue on the ScrapeTask table, shared by every API and worker node.
+
+    API side: run() inserts a task and waits for it. One poller per process reads
+    the outcome of all of its waiting tasks in a single query, deletes the rows
+    it collected and wakes the waiters.
+
+    Worker side (`python -m app.worker`): claim() takes the oldest queued task of
+    the most urgent priority with SELECT ... FOR UPDATE SKIP LOCKED, so workers
+    never take the same row or block on each other's claims. Sites already
+    running at their governor limit across the cluster are skipped, which makes
+    the per-site limits shared by all nodes (approximately: two claims can race
+    past the count). Running tasks carry a heartbeat; requeue_stale() hands tasks
+    of dead workers to others.
+
+    Inputs and results travel as JSON in the row.
+    """
+
+    def __init__(self, db_engine=engine):
+        self.engine = db_engine
+        self._waiting: Dict[int, asyncio.Future] = {}
+        self._poller: Optional[asyncio.Task] = None
+
+        # Metrics (this process)
+        self.enqueued = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self.claimed = 0
+        self.requeued = 0
+
+    # API side
+
+    async def run(
+        self, site: str, input_data: ScraperInput, priority: str = INTERACTIVE, timeout: float = SCRAPE_QUEUE_TIMEOUT
+    ) -> List[JobPost]:
+        loop = asyncio.get_running_loop()
+        task_id = await asyncio.to_thread(self._enqueue, site, input_data, priority)
+        self.enqueued += 1
+        future = loop.create_future()
+        self._waiting[task_id] = future
+        if self._poller is None or self._poller.done():
+            self._poller = loop.create_task(self._poll_loop())
+
+        try:
+            status, result, error = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            await asyncio.to_thread(self._cancel, task_id)
+            raise ScraperError(f"Queued scrape on {site} timed out after {timeout:.0f}s")
+        except asyncio.CancelledError:
+            # Dropped if nobody took it yet, otherwise the worker stops at its next page
+            self.cancelled += 1
+            loop.run_in_executor(None, self._cancel, task_id)
+            raise
+        finally:
+            self._waiting.pop(task_id, None)
+
+        if status == ScrapeTaskStatus.DONE:
+            self.completed += 1
+            return [JobPost(**job) for job in result or []]
+        self.failed += 1
+        raise ScraperError(error or f"Scrape on {site} failed")
+
+    def _enqueue(self, site: str, input_data: ScraperInput, priority: str) -> int:
+        with Session(self.engine) as session:
+            task = ScrapeTask(site=site, input=input_data.model_dump(mode="json"), priority=PRIORITIES[priority])
+            session.add(task)
+            session.commit()
+            return task.id
+
+    async def _poll_loop(self):
+        while self._waiting:
+            await asyncio.sleep(SCRAPE_QUEUE_POLL_SECONDS)
+            ids = list(self._waiting)
+            if not ids:
+                continue
+            try:
+                outcomes = await asyncio.to_thread(self._collect, ids)
+            except Exception as e:
+                logger.error(f"Polling the scrape queue failed: {e}")
+                continue
+            for task_id, outcome in outcomes.items():
+                future = self._waiting.get(task_id)
+                if future is not None and not future.done():
+                    future.set_result(outcome)
+
+    def _collect(self, ids: List[int]) -> Dict[int, Tuple[ScrapeTaskStatus, Optional[List[dict]], Optional[str]]]:
+        """Outcome of every finished task among `ids`; their rows are deleted."""
+        with Session(self.engine) as session:
+            rows = session.exec(
+                select(ScrapeTask).where(col(ScrapeTask.id).in_(ids), col(ScrapeTask.status).in_(FINISHED))
+            ).all()
+            outcomes = {row.id: (row.status, row.result, row.error) for row in rows}
+            if outcomes:
+                session.exec(delete(ScrapeTask).where(col(ScrapeTask.id).in_(list(outcomes))))
+                session.commit()
+            return outcomes
+
+    def _cancel(self, task_id: int):
+        with Session(self.engine) as session:
+            dropped = session.exec(
+                delete(ScrapeTask).where(ScrapeTask.id == task_id, ScrapeTask.status == ScrapeTaskStatus.QUEUED)
+            ).rowcount
+            if not dropped:
+                # Running: the worker sees this on its next heartbeat and deletes the row when done
+                session.exec(update(ScrapeTask).where(ScrapeTask.id == task_id).values(cancel_requested=True))
+            session.commit()
+
+    # Worker side (blocking, called from worker threads)
+
+    def claim(self, worker_id: str) -> Optional[Tuple[int, str, ScraperInput, str]]:
+        with Session(self.engine) as session:
+            running = session.exec(
+                select(ScrapeTask.site, func.count())
+                .where(ScrapeTask.status == ScrapeTaskStatus.RUNNING)
+                .group_by(ScrapeTask.site)
+            ).all()
+            full = [site for site, count in running if count >= governor.site_limits.get(site, governor.site_concurrency)]
+
+            query = select(ScrapeTask).where(ScrapeTask.status == ScrapeTaskStatus.QUEUED)
+            if full:
+                query = query.where(col(ScrapeTask.site).not_in(full))
+            query = query.order_by(ScrapeTask.priority, ScrapeTask.id).limit(1).with_for_update(skip_locked=True)
+            task = session.exec(query).first()
+            if task is None:
+                return None
+
+            priority = next((name for name, rank in PRIORITIES.items() if rank == task.priority), INTERACTIVE)
+            claimed = (task.id, task.site, ScraperInput(**task.input), priority)
+            task.status = ScrapeTaskStatus.RUNNING
+            task.worker = worker_id
+            task.attempts += 1
+            task.started_at = task.heartbeat_at = datetime.utcnow()
+            session.add(task)
+            session.commit()
+            self.claimed += 1
+            return claimed
+
+    def heartbeat(self, task_id: int) -> bool:
+        """Extend the task's lease. Returns True if its search no longer wants it."""
+        with Session(self.engine) as session:
+            task = session.get(ScrapeTask, task_id)
+            if task is None:
+                return True
+            task.heartbeat_at = datetime.utcnow()
+            session.add(task)
+            session.commit()
+            return task.cancel_requested
+
+    def finish(self, task_id: int, jobs: Optional[List[JobPost]] = None, error: Optional[str] = None):
+        with Session(self.engine) as session:
+            task = session.get(ScrapeTask, task_id)
+            if task is None:
+                return
+            if task.cancel_requested:
+                # Nobody is waiting for it anymore
+                session.delete(task)
+            else:
+                task.status = ScrapeTaskStatus.FAILED if error else ScrapeTaskStatus.DONE
+                task.result = [job.model_dump(mode="json") for job in jobs or []]
+                task.error = error
+                task.finished_at = datetime.utcnow()
+                session.add(task)
+            session.commit()
+
+    def requeue_stale(self) -> int:
+        """
+        Put tasks whose worker stopped heartbeating back on the queue (or fail them
+        after SCRAPE_QUEUE_MAX_ATTEMPTS), and delete finished rows nobody collected.
+        """
+        now = datetime.utcnow()
+        with Session(self.engine) as session:
+            stale = session.exec(
+                select(ScrapeTask)
+                .where(
+                    ScrapeTask.status == ScrapeTaskStatus.RUNNING,
+                    col(ScrapeTask.heartbeat_at) < now - timedelta(seconds=SCRAPE_QUEUE_LEASE_SECONDS),
+                )
+                .with_for_update(skip_locked=True)
+            ).all()
+            for task in stale:
+                logger.warning(f"Scrape task {task.id} on {task.site} lost its worker {task.worker}")
+                if task.cancel_requested:
+                    session.delete(task)
+                    continue
+                if task.attempts >= SCRAPE_QUEUE_MAX_ATTEMPTS:
+                    task.status = ScrapeTaskStatus.FAILED
+                    task.error = f"Scraper worker lost after {task.attempts} attempts"
+                    task.finished_at = now
+                else:
+                    task.status = ScrapeTaskStatus.QUEUED
+                    task.worker = None
+                    self.requeued += 1
+                session.add(task)
+
+            session.exec(
+                delete(ScrapeTask).where(
+                    col(ScrapeTask.status).in_(FINISHED),
+                    col(ScrapeTask.finished_at) < now - timedelta(seconds=SCRAPE_QUEUE_RETENTION_SECONDS),
+                )
+            )
+            session.commit()
+            return len(stale)
+
+    def stats(self) -> dict:
+        return {
+            "waiting": len(self._waiting),
+            "enqueued": self.enqueued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+            "claimed": self.claimed,
+            "requeued": self.requeued,
+        }
+
+
+scrape_queue = ScrapeQueue()
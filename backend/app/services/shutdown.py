@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import os
+import signal
+import time
+from typing import Optional
+
+logger = logging.getLogger("SearchDrain")
+
+# How long running searches get to wrap up once the server is shutting down
+SHUTDOWN_DRAIN_SECONDS = float(os.getenv("SHUTDOWN_DRAIN_SECONDS", 20))
+# How long scraper threads get to notice cancellation (and quit their browsers) afterwards
+SHUTDOWN_CLOSE_SECONDS = float(os.getenv("SHUTDOWN_CLOSE_SECONDS", 10))
+
+
+class SearchDrain:
+    """
+    Graceful shutdown for searches.
+
+    begin() (on SIGTERM/SIGINT, or from the shutdown hook) stops new searches
+    from being accepted and gives running ones until the drain deadline: they
+    start no further pass, stream and save what arrives before the deadline,
+    then cancel their scrapes, save what their scrapes already delivered and end
+    with a partial complete event. wait_idle() lets the shutdown hook wait for
+    that before closing sessions and browsers. There is one per API process,
+    covering every search that process is serving.
+    """
+
+    def __init__(self, drain_seconds: float = SHUTDOWN_DRAIN_SECONDS):
+        self.drain_seconds = drain_seconds
+        self.draining = False
+        self.deadline: Optional[float] = None
+        self.active = 0
+
+        # Metrics
+        self.cut_off = 0  # Searches ended early by the drain
+        self.flushed_jobs = 0  # Jobs saved from scrapes the drain cut short
+
+    def begin(self):
+        # Also runs inside a signal handler: only set flags here
+        if not self.draining:
+            self.draining = True
+            self.deadline = time.monotonic() + self.drain_seconds
+
+    def deadline_for(self, deadline: Optional[float]) -> Optional[float]:
+        """A search's own deadline, or the drain deadline if that comes first."""
+        if self.deadline is None:
+            return deadline
+        return self.deadline if deadline is None else min(deadline, self.deadline)
+
+    def enter(self):
+        self.active += 1
+
+    def leave(self):
+        self.active -= 1
+
+    async def wait_idle(self, grace: float = 1.0) -> bool:
+        """Wait until every search has ended, at most until shortly after the drain deadline."""
+        self.begin()
+        give_up = self.deadline + grace
+        while self.active and time.monotonic() < give_up:
+            await asyncio.sleep(0.1)
+        return self.active == 0
+
+    def install_signal_handlers(self):
+        """
+        Start draining as soon as the server is told to stop. Uvicorn keeps serving
+        open streams until they end, so waiting for the shutdown hook would be too late.
+        The previous handlers (uvicorn's) still run.
+        """
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            previous = signal.getsignal(sig)
+
+            def handler(signum, frame, previous=previous):
+                self.begin()
+                if callable(previous):
+                    previous(signum, frame)
+
+            try:
+                signal.signal(sig, handler)
+            except ValueError:
+                # Not the main thread (e.g. under a test client), the shutdown hook still drains
+                return
+
+    def stats(self) -> dict:
+        return {
+            "draining": self.draining,
+            "active_searches": self.active,
+            "drain_seconds": self.drain_seconds,
+            "cut_off": self.cut_off,
+            "flushed_jobs": self.flushed_jobs,
+        }
+
+
+search_drain = SearchDrain()
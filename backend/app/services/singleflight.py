@@ -0,0 +1,104 @@
+import asyncio
+import threading
+from typing import Awaitable, Callable, Dict, List
+
+from app.models.job import ScraperInput, JobPost
+from app.scrapers.base import current_cancel_event
+
+
+def scrape_key(site: str, input_data: ScraperInput) -> tuple:
+    """
+    Normalized identity of a scrape. results_wanted is left out on purpose, callers
+    compare it separately (a bigger scrape can answer a smaller one).
+    Experience bounds are ignored too, no scraper sends them to the site.
+    """
+    return (
+        site,
+        " ".join((input_data.search_term or "").lower().split()),
+        " ".join((input_data.location or "").lower().split()),
+        (input_data.country or "").lower(),
+        input_data.is_remote,
+        tuple(sorted(jt.value for jt in input_data.job_type)) if input_data.job_type else (),
+        input_data.hours_old,
+        input_data.offset,
+    )
+
+
+class _Flight:
+    def __init__(self, results_wanted: int):
+        self.results_wanted = results_wanted
+        self.cancel_event = threading.Event()
+        self.waiters = 0
+        self.task: asyncio.Task = None
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent scrapes.
+
+    The first caller for a key starts the scrape in its own task; callers that
+    arrive while it is running (asking for no more results than it does) wait on
+    the same task instead of scraping again. The scrape has its own cancel event
+    and is only cancelled once every waiter has gone away, so one search stopping
+    early doesn't cut the results short for the others.
+
+    Only searches of this process meet in a flight; other API processes run
+    their own copy of a scrape.
+    """
+
+    def __init__(self):
+        self._flights: Dict[tuple, _Flight] = {}
+        self.led = 0
+        self.joined = 0
+
+    def in_flight(self, key: tuple, results_wanted: int) -> bool:
+        flight = self._flights.get(key)
+        return flight is not None and flight.results_wanted >= results_wanted
+
+    async def do(self, key: tuple, results_wanted: int, fn: Callable[[], Awaitable[List[JobPost]]]) -> List[JobPost]:
+        flight = self._flights.get(key)
+        if flight is not None and flight.results_wanted >= results_wanted:
+            self.joined += 1
+        else:
+            self.led += 1
+            flight = _Flight(results_wanted)
+            flight.task = asyncio.create_task(self._run(flight, fn))
+            # A smaller flight for the same key keeps serving its own waiters
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _, key=key, flight=flight: self._forget(key, flight))
+
+        flight.waiters += 1
+        try:
+            jobs = await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+        # Every search scores its own copies
+        return [job.model_copy() for job in jobs]
+
+    async def _run(self, flight: _Flight, fn) -> List[JobPost]:
+        # Runs in the flight's own task context, so this doesn't touch the caller's
+        current_cancel_event.set(flight.cancel_event)
+        try:
+            return await fn()
+        except asyncio.CancelledError:
+            # Threads can't be interrupted, tell the scraper to stop at the next page
+            flight.cancel_event.set()
+            raise
+
+    def cancel_all(self):
+        """Stop every flight (server shutdown), scrapers see their cancel event at the next page."""
+        for flight in list(self._flights.values()):
+            flight.cancel_event.set()
+            flight.task.cancel()
+
+    def _forget(self, key: tuple, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._flights), "led": self.led, "joined": self.joined}
+
+
+singleflight = SingleFlight()
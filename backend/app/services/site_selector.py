@@ -0,0 +1,92 @@
+import os
+from typing import List, Optional, Tuple
+
+from app.scrapers.registry import SCRAPER_MODULES
+from app.services.planner import planner, PLANNER_MIN_SAMPLES, UNKNOWN_FILL
+
+# Sites picked at most by "auto" mode
+AUTO_MAX_SITES = int(os.getenv("AUTO_MAX_SITES", 6))
+# Remote-only boards added on top for remote searches (mostly one cheap feed request each)
+AUTO_MAX_REMOTE_SITES = int(os.getenv("AUTO_MAX_REMOTE_SITES", 4))
+
+# Countries a site has listings for (country names as sent by the frontend).
+# Sites not listed serve every country.
+SITE_COUNTRIES = {
+    "naukri": {"india"},
+    "bayt": {"uae", "saudi arabia", "qatar", "kuwait", "bahrain", "oman", "egypt", "jordan", "lebanon"},
+    # Same table as AdzunaScraper.country_domains
+    "adzuna": {
+        "usa", "uk", "india", "canada", "australia", "germany", "france", "italy",
+        "netherlands", "poland", "russia", "brazil", "south_africa", "spain", "austria",
+    },
+    # Same table as JoraScraper
+    "jora": {"australia", "new zealand", "singapore", "hong kong"},
+    "dice": {"usa"},
+    "builtin": {"usa"},
+    "themuse": {"usa"},
+    "ziprecruiter": {"usa", "canada"},
+}
+
+# Boards that only carry remote jobs, only worth asking for remote searches
+REMOTE_ONLY_SITES = {
+    "remotive", "himalayas", "jobicy", "weworkremotely", "jobspresso", "remote.co",
+    "workingnomads", "justremote", "remoteleaf", "skipthedrive", "arc",
+}
+
+# Never picked automatically: freelance gig boards, and guru needs a Chrome per scrape
+MANUAL_ONLY_SITES = {"guru", "peopleperhour", "truelancer"}
+
+
+def _eligible(site: str, country: str, is_remote: bool) -> bool:
+    if site in MANUAL_ONLY_SITES:
+        return False
+    if site in REMOTE_ONLY_SITES:
+        return is_remote
+    countries = SITE_COUNTRIES.get(site)
+    return countries is None or (country or "").lower() in countries
+
+
+def rank_sites(country: str, is_remote: bool, qclass: Optional[str] = None) -> List[Tuple[str, float]]:
+    """
+    Eligible sites for the search with a score, best first: expected share of
+    results delivered (planner fill ratio, failures included) per second of
+    latency, over every query class unless `qclass` is given. Sites with enough
+    history and nothing delivered are left out.
+    """
+    ranked = []
+    for site in SCRAPER_MODULES:
+        if not _eligible(site, country, is_remote):
+            continue
+        stats = planner.lookup(site, qclass, country) if qclass else planner.site_summary(site, country)
+        if stats is not None and stats.samples >= PLANNER_MIN_SAMPLES:
+            fill = stats.fill * (1 - stats.failure_rate)
+            if fill <= 0:
+                continue
+            ranked.append((site, fill / (1 + stats.latency)))
+        else:
+            # No history yet, rank like an average site so it gets tried
+            ranked.append((site, UNKNOWN_FILL / 2))
+    # Stable sort keeps the registry order among equals
+    ranked.sort(key=lambda item: item[1], reverse=True)
+    return ranked
+
+
+def auto_sites(country: str, is_remote: bool, qclass: Optional[str] = None, limit: int = AUTO_MAX_SITES) -> List[str]:
+    """
+    Sites for `auto` mode, in registry order.
+    """
+    ranked = [site for site, _ in rank_sites(country, is_remote, qclass)]
+    # Remote-only boards don't compete with general sites for the limit
+    chosen = set([site for site in ranked if site not in REMOTE_ONLY_SITES][:limit])
+    chosen.update([site for site in ranked if site in REMOTE_ONLY_SITES][:AUTO_MAX_REMOTE_SITES])
+    return [site for site in SCRAPER_MODULES if site in chosen]
+
+
+def expand_sites(sites: List[str], country: str, is_remote: bool, qclass: Optional[str] = None) -> List[str]:
+    """
+    Replace an "auto" entry with the automatic selection, keeping explicitly listed sites.
+    """
+    if not any(site.strip().lower() == "auto" for site in sites):
+        return sites
+    explicit = [site for site in sites if site.strip().lower() != "auto"]
+    return explicit + auto_sites(country, is_remote, qclass)
@@ -0,0 +1,337 @@
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from typing import List, Optional
+
+from app.models.job import ScraperInput, JobPost, ScraperError
+
+logger = logging.getLogger("ScraperWorkerPool")
+
+# "thread" runs scrapers on the governor's threads in the API process,
+# "process" runs them in a supervised pool of worker processes,
+# "queue" hands them to `python -m app.worker` nodes through the database (scrape_queue.py)
+SCRAPER_ISOLATION = os.getenv("SCRAPER_ISOLATION", "thread").lower()
+SCRAPER_PROCESS_WORKERS = int(os.getenv("SCRAPER_PROCESS_WORKERS", 4))
+# A scrape taking longer than this gets its worker killed
+SCRAPER_TASK_TIMEOUT = float(os.getenv("SCRAPER_TASK_TIMEOUT", 180))
+# Resident memory of a worker and the browsers it started, above which it is killed (mid scrape) or recycled (between scrapes)
+SCRAPER_WORKER_MAX_MEMORY_MB = int(os.getenv("SCRAPER_WORKER_MAX_MEMORY_MB", 1024))
+# Scrapes a worker runs before it is replaced, caps slow native leaks
+SCRAPER_WORKER_MAX_TASKS = int(os.getenv("SCRAPER_WORKER_MAX_TASKS", 100))
+
+# How often a waiting scrape checks its worker's health
+HEALTH_CHECK_SECONDS = 1.0
+
+
+def _rss_mb(pid: int) -> Optional[float]:
+    """Resident memory of a process in MB (Linux only, None elsewhere)."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _group_rss_mb(pgid: int) -> Optional[float]:
+    """
+    Resident memory of a whole process group in MB: a worker plus the Chrome and
+    chromedriver processes its scrapers started (Linux only, None elsewhere).
+    """
+    total = None
+    try:
+        pids = [entry for entry in os.listdir("/proc") if entry.isdigit()]
+    except OSError:
+        return None
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                # The command name may contain spaces, fields after it are fixed
+                fields = f.read().rsplit(")", 1)[1].split()
+            if int(fields[2]) != pgid:
+                continue
+        except (OSError, ValueError, IndexError):
+            continue  # Gone already
+        rss = _rss_mb(int(pid))
+        if rss is not None:
+            total = (total or 0) + rss
+    return total
+
+
+def _worker_main(conn):
+    """
+    Worker process loop. Messages from the parent:
+      ("task", task_id, site, ScraperInput)  -> ("result", task_id, jobs, error)
+      ("cancel", task_id)                    -> scraper stops at its next page
+      ("stop",)
+    """
+    # Own process group, so killing the worker also takes down Chrome and friends
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    from app.scrapers.registry import registry
+    from app.scrapers.base import current_cancel_event
+
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if msg[0] == "stop":
+            break
+        if msg[0] != "task":
+            continue  # Cancel for a task that already finished
+
+        _, task_id, site, input_data = msg
+        cancel_event = threading.Event()
+        outcome = {}
+
+        def run():
+            current_cancel_event.set(cancel_event)
+            try:
+                with registry.lease(site) as scraper:
+                    outcome["jobs"] = scraper.scrape(input_data)
+            except Exception as e:
+                outcome["error"] = f"{type(e).__name__}: {e}"
+
+        # Scrape on a thread so cancel messages are still read meanwhile
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        stopping = False
+        while thread.is_alive():
+            if conn.poll(0.2):
+                control = conn.recv()
+                if control[0] == "stop":
+                    stopping = True
+                if control[0] == "stop" or (control[0] == "cancel" and control[1] == task_id):
+                    cancel_event.set()
+            thread.join(0.05)
+
+        conn.send(("result", task_id, outcome.get("jobs"), outcome.get("error")))
+        if stopping:
+            break
+
+    registry.close_all()
+
+
+class _Worker:
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True, name="scraper-worker")
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+        self.reading: Optional[asyncio.Future] = None  # recv() in flight on an executor thread
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    def send(self, msg) -> bool:
+        try:
+            self.conn.send(msg)
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def kill(self):
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(self.pid, signal.SIGKILL)
+            else:
+                self.process.kill()
+        except (ProcessLookupError, PermissionError, OSError):
+            pass
+        self.process.join(1)
+        self.conn.close()
+
+    def stop(self):
+        self.send(("stop",))
+        self.process.join(2)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+class ProcessScraperPool:
+    """
+    Supervised pool of scraper worker processes.
+
+    A hung Selenium session, a native tls_client leak or a runaway parse only
+    takes down its worker, not the API. Each scrape runs in one worker; the
+    parent enforces SCRAPER_TASK_TIMEOUT and SCRAPER_WORKER_MAX_MEMORY_MB while
+    it waits, kills the worker's whole process group when either is exceeded
+    (or the worker dies), and starts a fresh one in its place. Workers are also
+    recycled after SCRAPER_WORKER_MAX_TASKS scrapes. Inputs and JobPost results
+    travel pickled over a pipe per worker. Workers start on the first scrape
+    sent to the pool, so an API in thread mode never spawns any.
+    """
+
+    def __init__(
+        self,
+        size: int = SCRAPER_PROCESS_WORKERS,
+        task_timeout: float = SCRAPER_TASK_TIMEOUT,
+        max_memory_mb: int = SCRAPER_WORKER_MAX_MEMORY_MB,
+        max_tasks: int = SCRAPER_WORKER_MAX_TASKS,
+    ):
+        self.size = max(1, size)
+        self.task_timeout = task_timeout
+        self.max_memory_mb = max_memory_mb
+        self.max_tasks = max_tasks
+        # Fresh interpreters, forking a threaded API process isn't safe
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle: Optional[asyncio.Queue] = None
+        self._workers: List[_Worker] = []
+        self._ids = itertools.count()
+
+        # Metrics
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.memory_kills = 0
+        self.crashes = 0
+        self.restarts = 0
+
+    def _start(self):
+        self._idle = asyncio.Queue()
+        for _ in range(self.size):
+            self._spawn()
+
+    def _spawn(self):
+        worker = _Worker(self._ctx)
+        self._workers.append(worker)
+        self._idle.put_nowait(worker)
+
+    def _replace(self, worker: _Worker):
+        worker.kill()
+        if worker in self._workers:
+            self._workers.remove(worker)
+        self.restarts += 1
+        self._spawn()
+
+    async def _release(self, worker: _Worker):
+        worker.tasks += 1
+        rss = await asyncio.to_thread(_group_rss_mb, worker.pid)
+        if worker.tasks >= self.max_tasks or (rss is not None and rss > self.max_memory_mb):
+            logger.info(f"Recycling scraper worker {worker.pid} after {worker.tasks} tasks ({rss or 0:.0f}MB)")
+            worker.stop()
+            if worker in self._workers:
+                self._workers.remove(worker)
+            self._spawn()
+            return
+        self._idle.put_nowait(worker)
+
+    async def run(self, site: str, input_data: ScraperInput) -> List[JobPost]:
+        if self._idle is None:
+            self._start()
+        worker = await self._idle.get()
+        task_id = next(self._ids)
+
+        try:
+            if not worker.send(("task", task_id, site, input_data)):
+                raise EOFError
+            _, _, jobs, error = await self._wait(worker, task_id)
+        except asyncio.CancelledError:
+            # Let the scraper stop at its next page and take the worker back when it reports
+            worker.send(("cancel", task_id))
+            asyncio.get_running_loop().create_task(self._drain(worker, task_id))
+            raise
+        except EOFError:
+            self.crashes += 1
+            self.failed += 1
+            self._replace(worker)
+            raise ScraperError(f"Scraper worker for {site} crashed")
+        except ScraperError:
+            self.failed += 1
+            self._replace(worker)
+            raise
+
+        await self._release(worker)
+        if error:
+            self.failed += 1
+            raise ScraperError(error)
+        self.completed += 1
+        return jobs
+
+    async def _wait(self, worker: _Worker, task_id: int):
+        loop = asyncio.get_running_loop()
+        deadline = time.monotonic() + self.task_timeout
+        while True:
+            if worker.reading is not None or await self._readable(worker, HEALTH_CHECK_SECONDS):
+                if worker.reading is None:
+                    # A whole pickled batch, read it off the event loop
+                    worker.reading = loop.run_in_executor(None, worker.conn.recv)
+                # Shielded: if the scrape is cancelled mid-read the message isn't lost,
+                # _drain picks up the same read
+                try:
+                    msg = await asyncio.shield(worker.reading)
+                except Exception:
+                    worker.reading = None
+                    raise
+                worker.reading = None
+                if msg[1] == task_id:
+                    return msg
+                continue
+
+            if not worker.process.is_alive():
+                raise EOFError
+            # Scans /proc, keep it off the event loop
+            rss = await asyncio.to_thread(_group_rss_mb, worker.pid)
+            if rss is not None and rss > self.max_memory_mb:
+                self.memory_kills += 1
+                raise ScraperError(f"Scraper worker exceeded {self.max_memory_mb}MB ({rss:.0f}MB)")
+            if time.monotonic() >= deadline:
+                self.timeouts += 1
+                raise ScraperError(f"Scrape timed out after {self.task_timeout:.0f}s")
+
+    @staticmethod
+    async def _readable(worker: _Worker, timeout: float) -> bool:
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        fd = worker.conn.fileno()
+        loop.add_reader(fd, lambda: ready.done() or ready.set_result(True))
+        try:
+            return await asyncio.wait_for(ready, timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            loop.remove_reader(fd)
+
+    async def _drain(self, worker: _Worker, task_id: int):
+        try:
+            await self._wait(worker, task_id)
+        except Exception:
+            self._replace(worker)
+            return
+        await self._release(worker)
+
+    def shutdown(self):
+        for worker in self._workers:
+            worker.stop()
+        self._workers.clear()
+        self._idle = None
+
+    def stats(self) -> dict:
+        return {
+            "mode": SCRAPER_ISOLATION,
+            "workers": [
+                {"pid": w.pid, "alive": w.process.is_alive(), "tasks": w.tasks, "rss_mb": round(_group_rss_mb(w.pid) or 0, 1)}
+                for w in self._workers
+            ],
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "memory_kills": self.memory_kills,
+            "crashes": self.crashes,
+            "restarts": self.restarts,
+        }
+
+
+process_pool = ProcessScraperPool()
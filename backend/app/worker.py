@@ -0,0 +1,128 @@
+"""
+Scrape worker node: `python -m app.worker`
+
+Runs the scrapes that API nodes started with SCRAPER_ISOLATION=queue put on the
+shared queue (the ScrapeTask table, see app/services/scrape_queue.py). Start as
+many as needed, on any host that reaches the database; each runs up to
+SCRAPE_WORKER_CONCURRENCY scrapes under its own governor. SIGTERM/SIGINT stops
+claiming and lets running scrapes finish.
+"""
+import asyncio
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+
+from app.db.session import create_db_and_tables
+from app.models.job import ScraperInput
+from app.scrapers.base import current_cancel_event
+from app.scrapers.registry import registry
+from app.scrapers import http, parsing
+from app.services.governor import governor
+from app.services.job_service import JobService
+from app.services.scrape_queue import scrape_queue, SCRAPE_QUEUE_POLL_SECONDS, SCRAPE_QUEUE_LEASE_SECONDS
+
+logger = logging.getLogger("ScrapeWorker")
+
+# Scrapes this node runs at once
+SCRAPE_WORKER_CONCURRENCY = int(os.getenv("SCRAPE_WORKER_CONCURRENCY", governor.max_concurrency))
+
+# Heartbeats per lease, so one missed beat doesn't lose the task
+HEARTBEATS_PER_LEASE = 3
+
+
+async def run_task(task_id: int, site: str, input_data: ScraperInput, priority: str):
+    # Own task context, the scraper threads see this scrape's cancel event
+    cancel_event = threading.Event()
+    current_cancel_event.set(cancel_event)
+
+    async def scrape():
+        async with governor.slot(site, priority):
+            return await JobService._scrape_local(site, input_data)
+
+    started = time.monotonic()
+    scraping = asyncio.create_task(scrape())
+    while not scraping.done():
+        await asyncio.wait({scraping}, timeout=SCRAPE_QUEUE_LEASE_SECONDS / HEARTBEATS_PER_LEASE)
+        if scraping.done():
+            break
+        try:
+            if await asyncio.to_thread(scrape_queue.heartbeat, task_id):
+                # Its search is gone, stop at the next page
+                cancel_event.set()
+                scraping.cancel()
+        except Exception as e:
+            logger.error(f"Heartbeat for task {task_id} failed: {e}")
+
+    jobs, error = None, None
+    try:
+        jobs = scraping.result()
+    except asyncio.CancelledError:
+        error = "Scrape cancelled"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    logger.info(f"Task {task_id} on {site}: {len(jobs) if jobs is not None else error} in {time.monotonic() - started:.1f}s")
+    await asyncio.to_thread(scrape_queue.finish, task_id, jobs, error)
+
+
+async def work(worker_id: str):
+    loop = asyncio.get_running_loop()
+    stopping = asyncio.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, stopping.set)
+        except NotImplementedError:
+            pass
+
+    slots = asyncio.Semaphore(SCRAPE_WORKER_CONCURRENCY)
+    running = set()
+    last_reap = 0.0
+
+    def done(task):
+        running.discard(task)
+        slots.release()
+
+    logger.info(f"Scrape worker {worker_id} started, {SCRAPE_WORKER_CONCURRENCY} slots")
+    while not stopping.is_set():
+        await slots.acquire()
+        try:
+            if time.monotonic() - last_reap > SCRAPE_QUEUE_LEASE_SECONDS / HEARTBEATS_PER_LEASE:
+                last_reap = time.monotonic()
+                await asyncio.to_thread(scrape_queue.requeue_stale)
+            claimed = await asyncio.to_thread(scrape_queue.claim, worker_id)
+        except Exception as e:
+            logger.error(f"Claiming from the scrape queue failed: {e}")
+            claimed = None
+
+        if claimed is None:
+            slots.release()
+            try:
+                await asyncio.wait_for(stopping.wait(), SCRAPE_QUEUE_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        task = asyncio.create_task(run_task(*claimed))
+        running.add(task)
+        task.add_done_callback(done)
+
+    # Finish what this node already took, whatever is left goes back on the queue once its lease runs out
+    logger.info(f"Stopping, waiting for {len(running)} running scrapes")
+    if running:
+        await asyncio.wait(running, timeout=SCRAPE_QUEUE_LEASE_SECONDS)
+    await http.aclose_clients()
+    registry.close_all()
+    parsing.shutdown()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    create_db_and_tables()
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    asyncio.run(work(worker_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.scrapers import parsing
+from app.scrapers.parsing import parse_html, parse_linkedin, parse_adzuna
+
+# Compare HTML parse throughput: one thread, a thread pool (GIL bound) and
+# parse_html() with the parse process pool. Pages are synthetic but shaped
+# like real LinkedIn / Adzuna result pages.
+
+WORDS = ["senior", "python", "backend", "engineer", "data", "platform", "remote", "cloud", "staff", "developer"]
+
+
+def linkedin_page(cards: int) -> str:
+    items = []
+    for i in range(cards):
+        title = " ".join(random.choices(WORDS, k=4)).title()
+        items.append(f"""
+<li><div class="base-card base-search-card job-search-card" data-entity-urn="urn:li:jobPosting:{i}">
+  <a class="base-card__full-link" href="https://www.linkedin.com/jobs/view/{title.replace(' ', '-').lower()}-{3900000000 + i}?refId=abc&trackingId=xyz">
+    <span class="sr-only">{title}</span>
+  </a>
+  <div class="base-search-card__info">
+    <h3 class="base-search-card__title">{title}</h3>
+    <h4 class="base-search-card__subtitle"><a href="https://www.linkedin.com/company/acme-{i}?trk=public_jobs">Acme {i}</a></h4>
+    <div class="base-search-card__metadata">
+      <span class="job-search-card__location">Austin, TX</span>
+      <time class="job-search-card__listdate" datetime="2024-01-01">1 week ago</time>
+    </div>
+  </div>
+</div></li>""")
+    return "<html><body><ul class='jobs-search__results-list'>" + "".join(items) + "</ul></body></html>"
+
+
+def adzuna_page(cards: int) -> str:
+    items = []
+    for i in range(cards):
+        title = " ".join(random.choices(WORDS, k=4)).title()
+        snippet = " ".join(random.choices(WORDS, k=60))
+        items.append(f"""
+<article data-aid="{4000000 + i}" class="a">
+  <h2><a href="/details/{4000000 + i}?se=abc">{title}</a></h2>
+  <div class="ui-company">Acme {i}</div>
+  <div class="ui-location">London</div>
+  <div class="ui-salary">£{40 + i % 20}k - £{60 + i % 20}k</div>
+  <span class="max-snippet-height">{snippet}</span>
+</article>""")
+    return "<html><body><main>" + "".join(items) + "</main></body></html>"
+
+
+def timed(parse_all) -> float:
+    start = time.perf_counter()
+    parse_all()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scraper HTML parse throughput")
+    parser.add_argument("--pages", type=int, default=48, help="Pages per site")
+    parser.add_argument("--cards", type=int, default=25, help="Job cards per page")
+    parser.add_argument("--threads", type=int, default=8, help="Concurrent scrapers (threads)")
+    args = parser.parse_args()
+
+    random.seed(1)
+    jobs = []
+    for _ in range(args.pages):
+        jobs.append((parse_linkedin, linkedin_page(args.cards), ()))
+        jobs.append((parse_adzuna, adzuna_page(args.cards), ("www.adzuna.co.uk", "London")))
+    total_bytes = sum(len(html) for _, html, _ in jobs)
+    print(f"{len(jobs)} pages, {total_bytes / len(jobs) / 1024:.0f}KB avg, {args.cards} cards each, "
+          f"{args.threads} threads, {parsing.PARSE_WORKERS} parse workers, {os.cpu_count()} CPUs")
+
+    def single():
+        for fn, html, extra in jobs:
+            fn(html, *extra)
+
+    def threaded():
+        with ThreadPoolExecutor(args.threads) as pool:
+            list(pool.map(lambda job: job[0](job[1], *job[2]), jobs))
+
+    def pooled():
+        # What the scrapers do: each scraper thread hands its page to the pool
+        with ThreadPoolExecutor(args.threads) as pool:
+            list(pool.map(lambda job: parse_html(job[0], job[1], *job[2]), jobs))
+
+    # Start the parse workers (and their imports) outside the timed run
+    list(parse_html(fn, html, *extra) for fn, html, extra in jobs[:parsing.PARSE_WORKERS * 2])
+
+    results = [
+        ("single thread", timed(single)),
+        (f"{args.threads} threads", timed(threaded)),
+        (f"process pool ({parsing.PARSE_WORKERS})", timed(pooled)),
+    ]
+    baseline = results[0][1]
+    for label, elapsed in results:
+        print(f"{label:>22}: {len(jobs) / elapsed:7.1f} pages/s  {elapsed:6.2f}s  x{baseline / elapsed:.2f}")
+
+    parsing.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -45,7 +45,7 @@ async def test_scraper(site, limit, job_type_str=None):
         return
 
     try:
-        jobs = scraper.scrape(input_data)
+        jobs = await scraper.ascrape(input_data)
         print(f"✅ {site}: Found {len(jobs)} jobs")
         if jobs:
             print(f"   Sample: {jobs[0].title} at {jobs[0].company}")
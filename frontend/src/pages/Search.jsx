@@ -12,7 +12,7 @@ export default function SearchPage() {
         search_term: 'Python Developer',
         location: 'India',
         results_wanted: 20,
-        sites: 'linkedin,indeed',
+        sites: 'auto',
         is_remote: false,
         country: 'india',
         job_type: [],
@@ -118,6 +118,9 @@ export default function SearchPage() {
                             const count = data.data.length;
                             setJobsFound(prev => prev + count);
                             setLogs(prev => [...prev, { type: 'success', message: `✓ Saved ${count} jobs to database` }]);
+                        } else if (data.type === 'result_evict') {
+                            // Earlier results pushed out of the top matches by better ones
+                            setJobsFound(prev => Math.max(0, prev - data.job_urls.length));
                         } else if (data.type === 'error') {
                             setLogs(prev => [...prev, { type: 'error', message: `✗ ${data.message}` }]);
                         }
@@ -313,8 +316,19 @@ export default function SearchPage() {
                 {/* Site Selection */}
                 < div className='mb-6'>
                     < label className='block text-sm font-medium text-gray-700 mb-3'>
-                        Select Job Sites({params.sites.split(',').filter(s => s).length} selected)
+                        Select Job Sites({params.sites.split(',').filter(s => s && s !== 'auto').length} selected)
                     </label >
+                    {/* "auto" lets the server pick the sites that serve the country and delivered best so far */}
+                    <label className='flex items-center space-x-2 cursor-pointer mb-4'>
+                        <input
+                            type='checkbox'
+                            checked={params.sites.split(',').includes('auto')}
+                            onChange={() => toggleSite('auto')}
+                            className='w-4 h-4 text-blue-600 border-gray-300 rounded focus:ring-blue-500'
+                        />
+                        <span className='text-sm font-medium text-gray-700'>Pick the best sites automatically</span>
+                        <span className='text-xs text-gray-500'>(sites selected below are searched too)</span>
+                    </label>
                     <div className='space-y-4'>
                         {
                             Object.entries(SITE_GROUPS).map(([groupName, groupSites]) => {